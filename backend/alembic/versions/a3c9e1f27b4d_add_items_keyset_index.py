@@ -0,0 +1,29 @@
+"""Add composite index for items keyset pagination
+
+Revision ID: a3c9e1f27b4d
+Revises: 56e56e3159e7
+Create Date: 2025-11-17 10:12:43.218904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e1f27b4d'
+down_revision: Union[str, Sequence[str], None] = '56e56e3159e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ORDER BY created_at DESC, id DESC はこのインデックスの逆順スキャンで処理される
+    op.create_index('ix_items_created_at_id', 'items', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_items_created_at_id', table_name='items')
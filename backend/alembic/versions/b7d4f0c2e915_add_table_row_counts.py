@@ -0,0 +1,90 @@
+"""Add trigger-maintained row counter for items
+
+Revision ID: b7d4f0c2e915
+Revises: a3c9e1f27b4d
+Create Date: 2025-11-18 09:41:05.537120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d4f0c2e915'
+down_revision: Union[str, Sequence[str], None] = 'a3c9e1f27b4d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('table_row_counts',
+    sa.Column('table_name', sa.String(length=63), nullable=False),
+    sa.Column('row_count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+    # 初期値の計算中に書き込みが入らないようにロックする（マイグレーションのトランザクション終了まで）
+    op.execute("LOCK TABLE items IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        "INSERT INTO table_row_counts (table_name, row_count) "
+        "SELECT 'items', count(*) FROM items"
+    )
+
+    # 文単位トリガー + 遷移テーブルで、一括INSERT/DELETEでもカウンター更新は1文につき1回
+    op.execute("""
+        CREATE FUNCTION table_row_counts_on_insert() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_row_counts
+            SET row_count = row_count + (SELECT count(*) FROM new_rows)
+            WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION table_row_counts_on_delete() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_row_counts
+            SET row_count = row_count - (SELECT count(*) FROM old_rows)
+            WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION table_row_counts_on_truncate() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_row_counts SET row_count = 0 WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER items_row_count_insert
+        AFTER INSERT ON items REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION table_row_counts_on_insert()
+    """)
+    op.execute("""
+        CREATE TRIGGER items_row_count_delete
+        AFTER DELETE ON items REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION table_row_counts_on_delete()
+    """)
+    op.execute("""
+        CREATE TRIGGER items_row_count_truncate
+        AFTER TRUNCATE ON items
+        FOR EACH STATEMENT EXECUTE FUNCTION table_row_counts_on_truncate()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER items_row_count_truncate ON items")
+    op.execute("DROP TRIGGER items_row_count_delete ON items")
+    op.execute("DROP TRIGGER items_row_count_insert ON items")
+    op.execute("DROP FUNCTION table_row_counts_on_truncate()")
+    op.execute("DROP FUNCTION table_row_counts_on_delete()")
+    op.execute("DROP FUNCTION table_row_counts_on_insert()")
+    op.drop_table('table_row_counts')
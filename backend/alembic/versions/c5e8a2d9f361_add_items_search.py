@@ -0,0 +1,55 @@
+"""Add full-text and trigram search for items
+
+Revision ID: c5e8a2d9f361
+Revises: b7d4f0c2e915
+Create Date: 2025-11-20 14:27:51.904312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a2d9f361'
+down_revision: Union[str, Sequence[str], None] = 'b7d4f0c2e915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # 生成列の追加はテーブルの書き換えを伴う（既存行の search_vector もここで計算される）
+    op.add_column('items', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+
+    # 大きなテーブルでも書き込みを止めないよう、インデックスはトランザクション外で CONCURRENTLY 作成する
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_items_search_vector', 'items', ['search_vector'],
+            unique=False, postgresql_using='gin', postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_items_title_trgm', 'items', ['title'],
+            unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_items_title_trgm', table_name='items')
+    op.drop_index('ix_items_search_vector', table_name='items')
+    op.drop_column('items', 'search_vector')
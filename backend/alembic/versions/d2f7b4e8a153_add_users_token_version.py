@@ -0,0 +1,32 @@
+"""Add token_version to users for bulk token revocation
+
+Revision ID: d2f7b4e8a153
+Revises: c5e8a2d9f361
+Create Date: 2025-11-24 10:12:38.415027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f7b4e8a153'
+down_revision: Union[str, Sequence[str], None] = 'c5e8a2d9f361'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 定数のデフォルト値を持つ列の追加はテーブルの書き換えを伴わない (PostgreSQL 11+)
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,36 @@
+"""Add case-insensitive unique index on users.email
+
+Revision ID: e8a1c6d4b927
+Revises: d2f7b4e8a153
+Create Date: 2025-11-26 15:03:22.681540
+
+大文字・小文字だけが異なるメールアドレスが既に登録されている場合、インデックスの作成は失敗します。
+事前に python -m scripts.normalize_emails --dry-run で重複を確認し、解消してから実行してください。
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a1c6d4b927'
+down_revision: Union[str, Sequence[str], None] = 'd2f7b4e8a153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 大きなテーブルでも書き込みを止めないよう、インデックスはトランザクション外で CONCURRENTLY 作成する
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email_lower', 'users', [sa.text('lower(email)')],
+            unique=True, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_email_lower', table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, Hashable, NamedTuple, Optional
+
+from app.core.config import settings
+from app.core.replica import primary_reads
+
+
+class LRUCache:
+    """
+    TTL付きのスレッドセーフなLRUキャッシュ
+
+    最大件数を超えると最も長く参照されていないエントリから破棄します。
+    ヒット数・ミス数を記録します。
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ========================================
+# レスポンスキャッシュのバックエンド
+#
+# タグの無効化はタグごとの世代番号で行います。キャッシュキーには取得時点の
+# 世代番号が含まれるため、無効化（世代番号の更新）後は古いエントリが参照されません。
+# DB読み取り中に無効化が起きても、古い世代のキーに保存されるだけなので安全です。
+# ========================================
+
+class CacheBackend:
+    """キャッシュバックエンドの基底クラス"""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        raise NotImplementedError
+
+    async def get_tag_version(self, tag: str) -> int:
+        raise NotImplementedError
+
+    async def invalidate_tag(self, tag: str) -> None:
+        raise NotImplementedError
+
+
+class NullCacheBackend(CacheBackend):
+    """キャッシュ無効時のバックエンド（常にミス）"""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        pass
+
+    async def get_tag_version(self, tag: str) -> int:
+        return 0
+
+    async def invalidate_tag(self, tag: str) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    プロセス内LRUキャッシュのバックエンド
+
+    無効化は同じプロセス内にのみ反映されます。複数ワーカーで動かす場合は
+    RedisCacheBackend を使用してください。
+    """
+
+    def __init__(self, maxsize: int):
+        self.entries = LRUCache(maxsize=maxsize)
+        self._tag_versions: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.entries.set(key, value, ttl=ttl)
+
+    async def get_tag_version(self, tag: str) -> int:
+        return self._tag_versions.get(tag, 0)
+
+    async def invalidate_tag(self, tag: str) -> None:
+        self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redisのバックエンド
+
+    redis.asyncio.Redis と同じインターフェースのクライアントを受け取ります。
+    テストでは fakeredis.aioredis.FakeRedis などのローカル実装を渡せます。
+    """
+
+    def __init__(self, client: Any, prefix: str = "cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.client.set(self.prefix + key, value, ex=ttl)
+
+    async def get_tag_version(self, tag: str) -> int:
+        version = await self.client.get(f"{self.prefix}tag:{tag}")
+        return int(version) if version is not None else 0
+
+    async def invalidate_tag(self, tag: str) -> None:
+        await self.client.incr(f"{self.prefix}tag:{tag}")
+
+
+class CachedResponse(NamedTuple):
+    """キャッシュされたレスポンス（ETagとJSONボディ）"""
+    etag: str
+    body: bytes
+
+
+class ResponseCache:
+    """
+    シリアライズ済みレスポンスのキャッシュ
+
+    ボディと一緒にETagを保存し、キャッシュヒット時も条件付きGETに応答できるようにします。
+
+    使用例:
+        key = await response_cache.key("items", "list", skip, limit)
+        cached = await response_cache.get(key)
+        if cached is None:
+            with response_cache.filling():
+                body = await build_response_json()
+            await response_cache.set(key, body, etag=body_etag(body))
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    async def key(self, tag: str, *parts: Any) -> str:
+        """タグの現在の世代番号とパラメータからキャッシュキーを生成"""
+        version = await self.backend.get_tag_version(tag)
+        return ":".join([tag, str(version), *(str(part) for part in parts)])
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        value = await self.backend.get(key)
+        if value is None:
+            return None
+        etag, body = value.split(b"\n", 1)
+        return CachedResponse(etag.decode(), body)
+
+    async def set(self, key: str, body: bytes, etag: str) -> None:
+        await self.backend.set(key, etag.encode() + b"\n" + body, self.ttl)
+
+    async def invalidate(self, tag: str) -> None:
+        """タグに属するすべてのエントリを無効化"""
+        await self.backend.invalidate_tag(tag)
+
+    def filling(self) -> AbstractContextManager:
+        """
+        キャッシュに保存する値を読み取るブロック
+
+        無効化の直後にレプリカから遅延した値（削除済みのアイテムなど）を読むと、
+        新しい世代のキーに保存されてTTLの間返され続けるため、キャッシュが有効な場合は
+        プライマリから読み取ります。キャッシュ無効時はレプリカを使用します。
+        """
+        if isinstance(self.backend, NullCacheBackend):
+            return nullcontext()
+        return primary_reads()
+
+
+def create_cache_backend() -> CacheBackend:
+    """設定 (CACHE_BACKEND) に応じたキャッシュバックエンドを生成"""
+    if settings.cache_backend == "redis":
+        import redis.asyncio as redis
+
+        return RedisCacheBackend(redis.Redis.from_url(settings.redis_url))
+    if settings.cache_backend == "memory":
+        return MemoryCacheBackend(maxsize=settings.cache_max_entries)
+    return NullCacheBackend()
+
+
+response_cache = ResponseCache(create_cache_backend(), ttl=settings.cache_ttl_seconds)
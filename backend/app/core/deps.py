@@ -1,36 +1,74 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Optional
 from fastapi import Depends, HTTPException, status, Cookie
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.core.security import decode_token
-from app.crud.user import get_user_by_id
-from app.models import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import async_session_scope
+from app.core.replica import primary_reads
+from app.core.revocation import revocation_store
+from app.core.security import REFRESH_TOKEN_TYPE, decode_token
+from app.core.user_cache import AuthenticatedUser, user_cache
+from app.crud.user import get_user_by_id_async
 
 
 # HTTPBearer スキーム
 security = HTTPBearer(auto_error=False)
 
 
-def get_db() -> Generator[Session, None, None]:
-    """データベースセッションを取得"""
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    データベースセッションを取得
+
+    DATABASE_ASYNC=true の場合は非同期ドライバーの AsyncSession、
+    false の場合は同期セッションの各操作をスレッドプールで実行する ThreadedSession を返します。
+    どちらも非同期版のCRUD関数（*_async）から同じように使用できます。
+    """
+    async with async_session_scope() as db:
         yield db
-    finally:
-        db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
+async def load_authenticated_user(db: AsyncSession, user_id: int) -> Optional[AuthenticatedUser]:
+    """
+    ユーザーをキャッシュから取得（キャッシュにない場合のみデータベースから読み込む）
+    """
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    generation = user_cache.generation
+    # レプリカの遅延した値（変更前の token_version など）をキャッシュに戻さないようプライマリから読む
+    with primary_reads():
+        db_user = await get_user_by_id_async(db, user_id=user_id)
+    if db_user is None:
+        return None
+    return user_cache.put(db_user, generation)
+
+
+async def is_token_revoked(payload: dict, user: AuthenticatedUser) -> bool:
+    """
+    トークンが失効しているか判定
+
+    ver クレームがユーザーの token_version と異なる（パスワード変更・全セッションのログアウト）か、
+    jti が失効ストアに登録されている（ログアウト・使用済みのリフレッシュトークン）場合に失効とみなします。
+    ユーザーはキャッシュから取得するため、通常はusersテーブルへの問い合わせは発生しません。
+    """
+    if payload.get("ver", 0) != user.token_version:
+        return True
+    jti = payload.get("jti")
+    return jti is not None and await revocation_store.is_revoked(jti)
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     access_token: Optional[str] = Cookie(None)
-) -> User:
+) -> AuthenticatedUser:
     """
     現在のユーザーを取得
 
     AuthorizationヘッダーまたはCookieからJWTトークンを取得し、
-    データベースからユーザー情報を取得します。
+    ユーザー情報を取得します。ユーザー情報はキャッシュされるため、
+    通常はデータベースへの問い合わせは発生しません。
+    失効したトークンとリフレッシュトークンは拒否します。
 
     優先順位:
     1. Authorizationヘッダー (Bearer トークン)
@@ -54,7 +92,7 @@ def get_current_user(
 
     payload = decode_token(token)
 
-    if payload is None:
+    if payload is None or payload.get("type") == REFRESH_TOKEN_TYPE:
         raise credentials_exception
 
     user_id: Optional[int] = payload.get("sub")
@@ -66,16 +104,16 @@ def get_current_user(
     except ValueError:
         raise credentials_exception
 
-    user = get_user_by_id(db, user_id=user_id)
-    if user is None:
+    user = await load_authenticated_user(db, user_id)
+    if user is None or await is_token_revoked(payload, user):
         raise credentials_exception
 
     return user
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_current_active_user(
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> AuthenticatedUser:
     """
     現在のアクティブユーザーを取得
 
@@ -89,9 +127,9 @@ def get_current_active_user(
     return current_user
 
 
-def get_current_superuser(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+async def get_current_superuser(
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
+) -> AuthenticatedUser:
     """
     現在のスーパーユーザーを取得
 
@@ -0,0 +1,122 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import Response, status
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def item_etag(item_id: int, updated_at: Optional[datetime]) -> str:
+    """
+    アイテムのETagを生成
+
+    updated_at はアイテムの更新ごとに変わるため、(id, updated_at) から
+    ボディをシリアライズせずに強いETagを算出できます。
+
+    Args:
+        item_id: アイテムID
+        updated_at: アイテムの更新日時
+
+    Returns:
+        str: ダブルクォートで囲まれたETag
+    """
+    version = _to_microseconds(updated_at) if updated_at else 0
+    return f'"{item_id}-{version}"'
+
+
+def _to_microseconds(value: datetime) -> int:
+    # float の timestamp() を経由すると丸め誤差が出るため、整数演算で算出する
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def item_versions_from_if_match(if_match: str, item_id: int) -> Optional[list[datetime]]:
+    """
+    If-Match ヘッダーからアイテムのバージョン (updated_at) を取り出す
+
+    item_etag() の逆変換です。RFC 9110 に従い強い比較を行うため、
+    弱いETag (W/) や別のアイテムのETagは一致しないものとして除外します。
+
+    Args:
+        if_match: If-Match ヘッダーの値
+        item_id: 更新対象のアイテムID
+
+    Returns:
+        Optional[list[datetime]]: 一致を許す updated_at のリスト（"*" の場合はNone）
+    """
+    if if_match.strip() == "*":
+        return None
+    versions = []
+    prefix = f'"{item_id}-'
+    for candidate in if_match.split(","):
+        candidate = candidate.strip()
+        if not (candidate.startswith(prefix) and candidate.endswith('"')):
+            continue
+        try:
+            microseconds = int(candidate[len(prefix):-1])
+        except ValueError:
+            continue
+        versions.append(_EPOCH + microseconds * _MICROSECOND)
+    return versions
+
+
+def body_etag(body: bytes) -> str:
+    """
+    レスポンスボディのハッシュからETagを生成
+
+    Args:
+        body: シリアライズ済みのレスポンスボディ
+
+    Returns:
+        str: ダブルクォートで囲まれたETag
+    """
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match ヘッダーがETagに一致するか判定
+
+    RFC 9110 に従い弱い比較（W/ プレフィックスを無視）を行います。
+
+    Args:
+        if_none_match: If-None-Match ヘッダーの値
+        etag: 現在のETag
+
+    Returns:
+        bool: 一致する場合True
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """304 Not Modified レスポンスを生成"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def json_response(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    """
+    ETag付きのJSONレスポンスを生成
+
+    If-None-Match がETagに一致する場合は 304 Not Modified を返します。
+
+    Args:
+        body: シリアライズ済みのJSONボディ
+        etag: ボディのETag
+        if_none_match: If-None-Match ヘッダーの値
+
+    Returns:
+        Response: 200 (JSON) または 304 のレスポンス
+    """
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
@@ -0,0 +1,55 @@
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Sequence
+
+from app.core.serialization import dumps, format_datetime
+
+
+async def ndjson_stream(
+    fields: Sequence[str],
+    batches: AsyncIterator[list[tuple]]
+) -> AsyncIterator[bytes]:
+    """
+    行のバッチをNDJSON（1行1オブジェクト）に変換
+
+    Args:
+        fields: 各列のキー名
+        batches: 列値のタプルのバッチ
+
+    Yields:
+        bytes: バッチごとのNDJSON
+    """
+    async for rows in batches:
+        yield b"".join(dumps(dict(zip(fields, row))) + b"\n" for row in rows)
+
+
+async def csv_stream(
+    fields: Sequence[str],
+    batches: AsyncIterator[list[tuple]]
+) -> AsyncIterator[bytes]:
+    """
+    行のバッチをCSV（1行目はヘッダー）に変換
+
+    日時はNDJSON・JSON APIと同じ形式（UTCは末尾Z）で出力します。
+
+    Args:
+        fields: ヘッダーの列名
+        batches: 列値のタプルのバッチ
+
+    Yields:
+        bytes: バッチごとのCSV
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for rows in batches:
+        writer.writerows(
+            [format_datetime(value) if isinstance(value, datetime) else value for value in row]
+            for row in rows
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
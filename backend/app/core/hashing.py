@@ -0,0 +1,135 @@
+import asyncio
+import os
+import secrets
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password, verify_password
+
+
+class HashingBusyError(Exception):
+    """ハッシュ処理の待ち行列が上限に達した場合のエラー（429で応答）"""
+
+
+class PasswordHasher:
+    """
+    パスワードハッシュ処理をプロセスプールで実行するサービス
+
+    bcryptは1回あたり数百ミリ秒CPUを占有するため、リクエストを処理する
+    ワーカープロセスの外で実行します。実行中・待機中の件数が max_pending に達した場合は
+    HashingBusyError を送出し、ログイン集中時も他のエンドポイントの応答性を保ちます。
+
+    プロセスプールと max_pending はgunicornのワーカーごとです。ホスト全体のハッシュ処理の
+    プロセス数は ワーカー数 × max_workers になるため、既定ではCPUコア数をワーカー数で割った
+    数にし、ログイン集中時もリクエストを処理するワーカーのCPUを残します。
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._dummy_hash: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        プロセスプールを起動し、ダミーのハッシュを生成
+
+        初回リクエストでプールの起動やハッシュの生成を待たないよう、起動時（lifespan）に呼び出します。
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                # 存在しないユーザーのログインでは検証だけを行うよう、現在の設定（ラウンド数）で先に生成する
+                self._dummy_hash = self._executor.submit(
+                    get_password_hash, secrets.token_urlsafe(16)
+                ).result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        self.start()
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise HashingBusyError("Password hashing queue is full")
+            self.pending += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def hash(self, password: str) -> str:
+        """パスワードをハッシュ化"""
+        return await asyncio.wrap_future(self._submit(get_password_hash, password))
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """パスワードを検証"""
+        return await asyncio.wrap_future(
+            self._submit(verify_password, plain_password, hashed_password)
+        )
+
+    async def verify_and_update(
+        self,
+        plain_password: str,
+        hashed_password: str
+    ) -> tuple[bool, Optional[str]]:
+        """パスワードを検証し、再ハッシュが必要な場合は新しいハッシュも返す"""
+        return await asyncio.wrap_future(
+            self._submit(verify_and_update_password, plain_password, hashed_password)
+        )
+
+    async def verify_dummy(self, plain_password: str) -> None:
+        """
+        ダミーのハッシュでパスワードを検証（結果は常に不一致）
+
+        存在しないメールアドレスでのログインにも登録済みユーザーと同じ時間をかけ、
+        応答時間からアカウントの有無を推測されないようにします。
+        ダミーのハッシュは start() で生成済みのため、検証1回分の時間だけがかかります。
+        """
+        self.start()
+        await self.verify(plain_password, self._dummy_hash)
+
+    def hash_sync(self, password: str) -> str:
+        """パスワードをハッシュ化（同期版）"""
+        return self._submit(get_password_hash, password).result()
+
+    def verify_sync(self, plain_password: str, hashed_password: str) -> bool:
+        """パスワードを検証（同期版）"""
+        return self._submit(verify_password, plain_password, hashed_password).result()
+
+    def verify_and_update_sync(
+        self,
+        plain_password: str,
+        hashed_password: str
+    ) -> tuple[bool, Optional[str]]:
+        """パスワードを検証し、再ハッシュが必要な場合は新しいハッシュも返す（同期版）"""
+        return self._submit(verify_and_update_password, plain_password, hashed_password).result()
+
+    def verify_dummy_sync(self, plain_password: str) -> None:
+        """ダミーのハッシュでパスワードを検証（同期版）"""
+        self.start()
+        self.verify_sync(plain_password, self._dummy_hash)
+
+
+password_hasher = PasswordHasher(
+    max_workers=(
+        settings.password_hash_workers
+        or max(1, (os.cpu_count() or 1) // settings.server_worker_count)
+    ),
+    max_pending=settings.password_hash_max_pending,
+)
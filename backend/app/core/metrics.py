@@ -0,0 +1,121 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# ========================================
+# Prometheus メトリクス（ルートのパステンプレートごと）
+# ========================================
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ["method", "route"],
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL statements per HTTP request",
+    ["method", "route"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Number of SQL statements executed per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+)
+
+
+class RequestTiming:
+    """1リクエスト内で実行されたSQL文の数と合計時間"""
+
+    __slots__ = ("db_queries", "db_time")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+
+    def server_timing(self, total: float) -> str:
+        """Server-Timing ヘッダーの値を生成（時間はミリ秒）"""
+        return (
+            f"app;dur={total * 1000:.1f}, "
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries"'
+        )
+
+
+# 実行中のリクエストの計測値
+# 非同期エンジン（greenlet）・スレッドプール（ThreadedSession）にもコンテキストが引き継がれるため、
+# 同じオブジェクトを更新することでリクエスト単位に集計される
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _current_timing.get() is not None:
+        context._timing_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    start = getattr(context, "_timing_start", None)
+    timing = _current_timing.get()
+    if start is None or timing is None:
+        return
+    timing.db_queries += 1
+    timing.db_time += time.perf_counter() - start
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    エンジンのSQL実行を計測対象にする
+
+    非同期エンジンの場合は async_engine.sync_engine を渡します。
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_label(scope: Scope) -> str:
+    # 実際のパスではなくルートのテンプレート（/api/items/{item_id}）を使い、ラベルの種類を抑える
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class TimingMiddleware:
+    """
+    リクエストごとの処理時間・SQL実行回数・DB時間を計測するASGIミドルウェア
+
+    レスポンスには Server-Timing ヘッダー（ブラウザの開発者ツールで表示される）を付与し、
+    レスポンス完了時にルートごとのPrometheusヒストグラムに記録します。
+    ストリーミングレスポンスの場合、ヘッダーの値はレスポンス開始時点までの計測値です。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timing.server_timing(time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_timing.reset(token)
+            labels = (scope["method"], _route_label(scope))
+            REQUEST_DURATION.labels(*labels).observe(elapsed)
+            REQUEST_DB_DURATION.labels(*labels).observe(timing.db_time)
+            REQUEST_DB_QUERIES.labels(*labels).observe(timing.db_queries)
@@ -0,0 +1,82 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """
+    キーセットページネーション用のカーソルを生成
+
+    (created_at, id) をJSON化してURLセーフなBase64に変換します。
+    クライアントからは中身を意識しない不透明な文字列として扱われます。
+
+    Args:
+        created_at: 最後に返したアイテムの作成日時
+        item_id: 最後に返したアイテムのID
+
+    Returns:
+        str: カーソル文字列
+    """
+    raw = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    カーソル文字列を (created_at, id) に復元
+
+    Args:
+        cursor: encode_cursor で生成したカーソル文字列
+
+    Returns:
+        tuple[datetime, int]: 作成日時とアイテムID
+
+    Raises:
+        ValueError: カーソルの形式が不正な場合
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_search_cursor(fuzzy: bool, score: float, item_id: int) -> str:
+    """
+    検索結果のキーセットページネーション用のカーソルを生成
+
+    スコア順 (score DESC, id DESC) の位置に加えて、どちらの検索方式
+    （全文検索 / トライグラム類似検索）の結果かを保持します。
+
+    Args:
+        fuzzy: トライグラム類似検索の結果の場合True
+        score: 最後に返したアイテムのスコア
+        item_id: 最後に返したアイテムのID
+
+    Returns:
+        str: カーソル文字列
+    """
+    raw = json.dumps([int(fuzzy), score, item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[bool, float, int]:
+    """
+    検索カーソル文字列を (fuzzy, score, id) に復元
+
+    Args:
+        cursor: encode_search_cursor で生成したカーソル文字列
+
+    Returns:
+        tuple[bool, float, int]: 検索方式、スコア、アイテムID
+
+    Raises:
+        ValueError: カーソルの形式が不正な場合
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        fuzzy, score, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return bool(fuzzy), float(score), int(item_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
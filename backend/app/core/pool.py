@@ -0,0 +1,90 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class CheckoutStats:
+    """
+    コネクションのチェックアウト待ち時間の統計
+
+    プールからコネクションを取り出すまでにかかった時間（待機 + 新規接続）を集計します。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+
+
+class _TimedPoolMixin:
+    """チェックアウト時間を計測するプールのMixin"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = CheckoutStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.checkout_stats.record(time.perf_counter() - start)
+        return conn
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """チェックアウト時間を計測する QueuePool（同期エンジン用）"""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """チェックアウト時間を計測する AsyncAdaptedQueuePool（非同期エンジン用）"""
+
+
+def pool_status(pool: Pool) -> dict:
+    """
+    プールの現在の状態とチェックアウト統計を取得
+
+    Args:
+        pool: SQLAlchemyのコネクションプール
+
+    Returns:
+        dict: プールサイズ、使用中・待機中・オーバーフローの接続数、チェックアウト待ち時間
+    """
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # overflow() は pool_size を基準にした値で、未使用分は負になる
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "checkouts": 0,
+        "checkout_timeouts": 0,
+        "avg_wait_ms": 0.0,
+        "max_wait_ms": 0.0,
+    }
+
+    stats: CheckoutStats | None = getattr(pool, "checkout_stats", None)
+    if stats is not None:
+        attempts = stats.checkouts + stats.timeouts
+        status.update(
+            checkouts=stats.checkouts,
+            checkout_timeouts=stats.timeouts,
+            avg_wait_ms=stats.total_wait / attempts * 1000 if attempts else 0.0,
+            max_wait_ms=stats.max_wait * 1000,
+        )
+    return status
@@ -0,0 +1,174 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from app.core.config import settings
+
+
+class RateLimitExceededError(Exception):
+    """レート制限を超過した場合のエラー（429で応答）"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Rate limit exceeded")
+        self.retry_after = retry_after
+
+
+class Rate(NamedTuple):
+    """トークンバケットの設定（最大バースト数と1秒あたりの補充数）"""
+    capacity: int
+    per_second: float
+
+    @classmethod
+    def per_minute(cls, count: int, burst: int) -> "Rate":
+        return cls(capacity=burst, per_second=count / 60)
+
+
+# ========================================
+# トークンバケットのバックエンド
+#
+# consume() はトークンを1つ消費し、許可した場合は 0、拒否した場合は
+# 次のトークンが補充されるまでの秒数を返します。
+# ========================================
+
+class RateLimitBackend:
+    """レート制限バックエンドの基底クラス"""
+
+    async def consume(self, key: str, rate: Rate) -> float:
+        raise NotImplementedError
+
+
+class NullRateLimitBackend(RateLimitBackend):
+    """レート制限無効時のバックエンド（常に許可）"""
+
+    async def consume(self, key: str, rate: Rate) -> float:
+        return 0.0
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    プロセス内のトークンバケット
+
+    キーごとに（残りトークン数, 最終更新時刻）だけを保持し、1回の判定は数マイクロ秒です。
+    多数のIPアドレスから攻撃された場合もメモリを使い切らないよう、
+    キーの数が maxsize を超えると最も長く使われていないバケットから破棄します。
+
+    制限は同じプロセス内にのみ適用されます。複数ワーカーで動かす場合は
+    RedisRateLimitBackend を使用してください。
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def consume(self, key: str, rate: Rate) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (rate.capacity, now))
+            tokens = min(rate.capacity, tokens + (now - updated_at) * rate.per_second)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / rate.per_second
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+# バケットの更新をRedis内で不可分に行うスクリプト（時刻はRedisサーバーの時計を使用）
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local per_second = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * per_second)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / per_second
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / per_second * 1000))
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Redisのトークンバケット（全ワーカーで共有）
+
+    redis.asyncio.Redis と同じインターフェースのクライアントを受け取ります。
+    テストでは fakeredis.aioredis.FakeRedis などのローカル実装を渡せます。
+    バケットは満杯に戻るまでの時間で失効するため、使われなくなったキーは残りません。
+    """
+
+    def __init__(self, client: Any, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def consume(self, key: str, rate: Rate) -> float:
+        retry_after = await self._script(
+            keys=[self.prefix + key], args=[rate.capacity, rate.per_second]
+        )
+        return float(retry_after)
+
+
+class LoginRateLimiter:
+    """
+    ログイン試行のレート制限
+
+    送信元IPアドレスごとと、メールアドレスごとのトークンバケットで制限します。
+    IPアドレスの制限で単一の送信元からの総当たりを、メールアドレスの制限で
+    多数の送信元から特定のアカウントを狙う攻撃を防ぎます。
+    データベースへの問い合わせやbcryptの前に呼び出し、超過した試行は計算資源を使わずに拒否します。
+    """
+
+    def __init__(self, backend: RateLimitBackend, per_ip: Rate, per_email: Rate):
+        self.backend = backend
+        self.per_ip = per_ip
+        self.per_email = per_email
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        # キーにメールアドレスを平文で残さない（Redisに保存される場合も同様）
+        return hashlib.blake2b(email.strip().lower().encode(), digest_size=12).hexdigest()
+
+    async def check(self, ip: str, email: str) -> None:
+        """試行を1回分消費し、制限を超過している場合は RateLimitExceededError を送出"""
+        retry_after = await self.backend.consume(f"login:ip:{ip}", self.per_ip)
+        if retry_after == 0:
+            retry_after = await self.backend.consume(
+                f"login:email:{self._email_key(email)}", self.per_email
+            )
+        if retry_after > 0:
+            raise RateLimitExceededError(retry_after)
+
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    """設定 (RATE_LIMIT_BACKEND) に応じたレート制限バックエンドを生成"""
+    if settings.rate_limit_backend == "redis":
+        import redis.asyncio as redis
+
+        return RedisRateLimitBackend(redis.Redis.from_url(settings.redis_url))
+    if settings.rate_limit_backend == "memory":
+        return MemoryRateLimitBackend(maxsize=settings.rate_limit_max_keys)
+    return NullRateLimitBackend()
+
+
+login_rate_limiter = LoginRateLimiter(
+    create_rate_limit_backend(),
+    per_ip=Rate.per_minute(settings.login_rate_limit_per_ip, burst=settings.login_rate_limit_ip_burst),
+    per_email=Rate.per_minute(
+        settings.login_rate_limit_per_email, burst=settings.login_rate_limit_email_burst
+    ),
+)
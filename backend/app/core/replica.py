@@ -0,0 +1,150 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional, Sequence
+
+from sqlalchemy import Select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 書き込み後にプライマリから読み取る期間を示すCookie（値は期限のUNIX時刻）
+PRIMARY_COOKIE = "db_primary_until"
+
+
+class ReplicaSet:
+    """リードレプリカのエンジンをラウンドロビンで選択"""
+
+    def __init__(self, engines: Sequence[Engine]):
+        self.engines = list(engines)
+        self._cycle = itertools.cycle(self.engines)
+        self._lock = threading.Lock()
+
+    def next(self) -> Engine:
+        with self._lock:
+            return next(self._cycle)
+
+
+class RoutingState:
+    """1リクエスト内のルーティング状態"""
+
+    __slots__ = ("use_primary", "wrote")
+
+    def __init__(self, use_primary: bool = False):
+        # 直前の書き込みから一定期間内のクライアントはプライマリから読み取る
+        self.use_primary = use_primary
+        # このリクエストで書き込みを行った（レスポンスでCookieを設定する）
+        self.wrote = False
+
+
+_routing_state: ContextVar[Optional[RoutingState]] = ContextVar("db_routing_state", default=None)
+_primary_reads: ContextVar[bool] = ContextVar("db_primary_reads", default=False)
+
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    """
+    ブロック内の読み取りをプライマリで行う
+
+    共有キャッシュに保存する値や認証情報など、レプリカの遅延で古い値を読むと
+    無効化後もキャッシュのTTLの間残り続けてしまう読み取りに使用します。
+    """
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+class RoutingSession(Session):
+    """
+    読み取りをリードレプリカ、書き込みをプライマリに振り分けるセッション
+
+    SELECT文はレプリカにラウンドロビンで送信します。次の場合はプライマリを使用します。
+    - INSERT/UPDATE/DELETE とフラッシュ
+    - 同じセッションで書き込みを行った後の読み取り（リフレッシュなど）
+    - ReadYourWritesMiddleware により、直前に書き込んだクライアントと判定されたリクエスト
+    - primary_reads() のブロック内（キャッシュに保存する値の読み取りなど）
+
+    AsyncSession では async_sessionmaker(sync_session_class=RoutingSession) として使用します。
+    """
+
+    def __init__(self, *args: Any, replicas: Optional[ReplicaSet] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self._wrote = False
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Engine:
+        if self._flushing or isinstance(clause, UpdateBase):
+            self._mark_written()
+        elif self.replicas is not None and isinstance(clause, Select) and not self._use_primary():
+            return self.replicas.next()
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def _use_primary(self) -> bool:
+        if self._wrote or _primary_reads.get():
+            return True
+        state = _routing_state.get()
+        return state is not None and state.use_primary
+
+    def _mark_written(self) -> None:
+        self._wrote = True
+        state = _routing_state.get()
+        if state is not None:
+            state.wrote = True
+
+
+class ReadYourWritesMiddleware:
+    """
+    書き込みを行ったクライアントの読み取りを一定期間プライマリに固定するASGIミドルウェア
+
+    書き込みを行ったリクエストのレスポンスにCookieを設定し、期限内のリクエストでは
+    RoutingSession がプライマリから読み取ります。レプリカの遅延により、作成・更新した
+    直後のアイテムが一覧や詳細に反映されない問題を防ぎます。
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = RoutingState(use_primary=self._within_window(scope))
+        token = _routing_state.set(state)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.wrote:
+                expires_at = time.time() + self.window_seconds
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{PRIMARY_COOKIE}={expires_at:.3f}; Max-Age={int(self.window_seconds) or 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _routing_state.reset(token)
+
+    @staticmethod
+    def _within_window(scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                expires_at = cookie_parser(value.decode("latin-1")).get(PRIMARY_COOKIE)
+                if expires_at is None:
+                    continue
+                try:
+                    return float(expires_at) > time.time()
+                except ValueError:
+                    return False
+        return False
@@ -0,0 +1,114 @@
+import heapq
+import math
+import threading
+import time
+from typing import Any
+
+from app.core.config import settings
+
+
+# ========================================
+# 失効したトークン（jti）のストア
+#
+# jti はトークンの有効期限までだけ保持すれば十分なため、各エントリは
+# トークンの残り有効期間をTTLとして保存し、期限後に自動的に削除されます。
+# ========================================
+
+class RevocationStore:
+    """失効トークンストアの基底クラス"""
+
+    async def revoke(self, jti: str, ttl: float) -> bool:
+        """
+        jti を失効させる
+
+        新たに失効させた場合は True、すでに失効していた場合は False を返します。
+        リフレッシュトークンのローテーションでは、この戻り値で使用済みトークンの再利用を検出します。
+        """
+        raise NotImplementedError
+
+    async def is_revoked(self, jti: str) -> bool:
+        raise NotImplementedError
+
+
+class MemoryRevocationStore(RevocationStore):
+    """
+    プロセス内の失効トークンストア
+
+    失効はエビクションで消えてはいけないため、LRUではなく期限付きの辞書で保持し、
+    期限切れのエントリは追加時に期限順のヒープから削除します。
+    UUIDの jti は16バイトのバイナリとして保存します。
+
+    失効は同じプロセス内にのみ反映されます。複数ワーカーで動かす場合は
+    RedisRevocationStore を使用してください。
+    """
+
+    def __init__(self):
+        self._expires: dict[bytes, float] = {}
+        self._heap: list[tuple[float, bytes]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(jti: str) -> bytes:
+        try:
+            return bytes.fromhex(jti)
+        except ValueError:
+            return jti.encode()
+
+    def _purge(self, now: float) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            _, key = heapq.heappop(self._heap)
+            self._expires.pop(key, None)
+
+    async def revoke(self, jti: str, ttl: float) -> bool:
+        key = self._key(jti)
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            if key in self._expires:
+                return False
+            expires_at = now + max(ttl, 1.0)
+            self._expires[key] = expires_at
+            heapq.heappush(self._heap, (expires_at, key))
+            return True
+
+    async def is_revoked(self, jti: str) -> bool:
+        expires_at = self._expires.get(self._key(jti))
+        return expires_at is not None and expires_at > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+
+class RedisRevocationStore(RevocationStore):
+    """
+    Redisの失効トークンストア（全ワーカーで共有）
+
+    redis.asyncio.Redis と同じインターフェースのクライアントを受け取ります。
+    テストでは fakeredis.aioredis.FakeRedis などのローカル実装を渡せます。
+    SET NX により、同じリフレッシュトークンの同時使用でも成功するのは1リクエストだけです。
+    """
+
+    def __init__(self, client: Any, prefix: str = "revoked:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def revoke(self, jti: str, ttl: float) -> bool:
+        created = await self.client.set(
+            self.prefix + jti, b"1", ex=max(math.ceil(ttl), 1), nx=True
+        )
+        return bool(created)
+
+    async def is_revoked(self, jti: str) -> bool:
+        return bool(await self.client.exists(self.prefix + jti))
+
+
+def create_revocation_store() -> RevocationStore:
+    """設定 (TOKEN_REVOCATION_BACKEND) に応じた失効トークンストアを生成"""
+    if settings.token_revocation_backend == "redis":
+        import redis.asyncio as redis
+
+        return RedisRevocationStore(redis.Redis.from_url(settings.redis_url))
+    return MemoryRevocationStore()
+
+
+revocation_store = create_revocation_store()
@@ -1,31 +1,79 @@
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+from app.core.cache import LRUCache
 from app.core.config import settings
 
-# パスワードハッシュ化設定
-# bcryptのラウンド数とアルゴリズムバージョンを明示的に指定
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__default_ident="2b",
-    bcrypt__default_rounds=12
-)
+# python-jose と passlib は読み込みに時間がかかるため、起動時ではなく最初の使用時に読み込む
+# （パスワード処理はプロセスプール側で実行されるため、リクエスト処理側では読み込まれない）
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@lru_cache(maxsize=None)
+def get_pwd_context() -> "CryptContext":
+    """
+    パスワードハッシュ化設定を取得
+
+    新しいハッシュは PASSWORD_HASH_SCHEME の方式で生成します。それ以外の方式のハッシュと、
+    設定より低いコスト（bcryptのラウンド数、argon2のパラメータ）のハッシュは
+    needs_update() が True となり、ログイン成功時に再ハッシュされます。
+    bcryptはコストを下げた場合に既存のハッシュを弱めないよう、下限のみ指定しています。
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["argon2", "bcrypt"],
+        default=settings.password_hash_scheme,
+        deprecated="auto",
+        bcrypt__default_ident="2b",
+        bcrypt__default_rounds=settings.bcrypt_rounds,
+        bcrypt__min_rounds=settings.bcrypt_rounds,
+        argon2__type="ID",
+        argon2__time_cost=settings.argon2_time_cost,
+        argon2__memory_cost=settings.argon2_memory_cost,
+        argon2__parallelism=settings.argon2_parallelism
+    )
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """プレーンパスワードとハッシュ化されたパスワードを検証"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """
+    パスワードを検証し、ハッシュが現在の設定と異なる場合は新しいハッシュも返す
+
+    戻り値は (検証結果, 新しいハッシュ)。再ハッシュが不要な場合、新しいハッシュは None です。
+    """
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """パスワードをハッシュ化"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+
+# トークンの種類（typeクレーム）。リフレッシュトークンをアクセストークンとして使えないようにする
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    """アクセストークンを生成"""
+    """
+    アクセストークンを生成
+
+    失効（ログアウト）できるよう、トークンごとに一意な jti クレームを付与します。
+    """
+    from jose import jwt
+
     to_encode = data.copy()
 
     if expires_delta:
@@ -35,7 +83,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             minutes=settings.access_token_expire_minutes
         )
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "type": ACCESS_TOKEN_TYPE})
     encoded_jwt = jwt.encode(
         to_encode,
         settings.secret_key,
@@ -45,10 +93,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def create_refresh_token(data: dict) -> str:
-    """リフレッシュトークンを生成"""
+    """
+    リフレッシュトークンを生成
+
+    jti はローテーション時に使用済みとして記録され、同じトークンは2回使用できません。
+    """
+    from jose import jwt
+
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "type": REFRESH_TOKEN_TYPE})
 
     encoded_jwt = jwt.encode(
         to_encode,
@@ -58,14 +112,44 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 
+# 検証済みトークンのキャッシュ（キー: トークンのSHA-256ダイジェスト、有効期限: トークンのexp）
+token_cache = LRUCache(maxsize=settings.token_cache_max_entries)
+
+
 def decode_token(token: str) -> Optional[dict]:
-    """トークンをデコード"""
+    """
+    トークンをデコード
+
+    署名検証済みのペイロードをトークンの有効期限までキャッシュするため、
+    同じトークンの2回目以降の検証では署名計算とクレームの解析を省略します。
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token,
             settings.secret_key,
             algorithms=[settings.algorithm]
         )
-        return payload
     except JWTError:
         return None
+
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = exp - time.time()
+        if ttl > 0:
+            token_cache.set(key, dict(payload), ttl=ttl)
+    return payload
+
+
+def token_ttl(payload: dict) -> float:
+    """トークンの残り有効期間（秒）。失効ストアのTTLに使用"""
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)):
+        return float(settings.refresh_token_expire_days * 24 * 60 * 60)
+    return max(exp - time.time(), 0.0)
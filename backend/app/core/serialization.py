@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+
+import orjson
+from pydantic import BaseModel
+
+
+def serialization_keys(model: type[BaseModel]) -> list[str]:
+    """
+    モデルのフィールドをJSON出力時のキー名に変換
+
+    serialization_alias（ItemResponse）や alias_generator（CamelCaseModel）の
+    設定に従い、model_dump(by_alias=True) と同じキー名をフィールド定義順で返します。
+    """
+    return [
+        field.serialization_alias or field.alias or name
+        for name, field in model.model_fields.items()
+    ]
+
+
+def dumps(value: Any) -> bytes:
+    """
+    orjsonでJSONバイト列にエンコード
+
+    datetime は Pydantic と同じ形式（UTCは末尾Z）で出力します。
+    """
+    return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+
+
+def format_datetime(value: datetime) -> str:
+    """
+    datetime を dumps() と同じ文字列に変換（UTCは末尾Z）
+
+    CSVなどJSON以外の出力でも、JSON APIと同じ形式の日時を出力するために使用します。
+    """
+    return orjson.dumps(value, option=orjson.OPT_UTC_Z)[1:-1].decode()
+
+
+class RowEncoder:
+    """
+    列タプルをPydanticモデルと同じJSONオブジェクトに変換するエンコーダー
+
+    モデルのフィールド定義順に列を取得したタプルを受け取り、モデルの生成と
+    検証を行わずに model_dump(by_alias=True) と同じキー・順序の辞書を作ります。
+    DBから取得した値はスキーマ制約を満たしている前提のため、検証は省略します。
+
+    使用例:
+        encoder = RowEncoder(ItemResponse)
+        columns = [getattr(Item, name) for name in encoder.fields]
+        rows = db.execute(select(*columns)).all()
+        body = dumps({"items": encoder.to_dicts(rows)})
+    """
+
+    def __init__(self, model: type[BaseModel]):
+        self.fields: list[str] = list(model.model_fields)
+        self.keys: list[str] = serialization_keys(model)
+
+    def to_dict(self, row: Sequence[Any]) -> dict[str, Any]:
+        return dict(zip(self.keys, row))
+
+    def to_dicts(self, rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """
+    認証済みユーザーのスナップショット
+
+    セッションに紐付かない読み取り専用の値オブジェクトです。
+    リクエスト間でキャッシュを共有しても安全なように、ORMインスタンスの代わりに使用します。
+    """
+    id: int
+    email: str
+    username: str
+    is_active: bool
+    is_superuser: bool
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    token_version: int = 0
+
+    @classmethod
+    def from_model(cls, user: User) -> "AuthenticatedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+            token_version=user.token_version,
+        )
+
+
+class RedisInvalidationChannel:
+    """
+    Redis Pub/Subによるワーカー間のキャッシュ無効化チャネル
+
+    redis.Redis（同期版）と同じインターフェースのクライアントを受け取ります。
+    購読はバックグラウンドスレッドで行います。publish はRedisへの往復を待つブロッキング呼び出しのため、
+    非同期のコードからは UserCache.invalidate_async() を使用してください。
+    """
+
+    def __init__(self, client: Any, channel: str = "user-cache-invalidate"):
+        self.client = client
+        self.channel = channel
+        self._thread = None
+
+    def publish(self, user_id: int) -> None:
+        try:
+            self.client.publish(self.channel, str(user_id))
+        except Exception:
+            # 通知に失敗しても他ワーカーのキャッシュはTTLで失効する
+            logger.warning("Failed to publish user cache invalidation", exc_info=True)
+
+    def start(self, on_invalidate) -> None:
+        def handler(message):
+            on_invalidate(int(message["data"]))
+
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: handler})
+        self._thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+
+class UserCache:
+    """
+    認証済みユーザーのキャッシュ
+
+    ユーザーIDをキーにしたTTL付きLRUキャッシュです。ユーザー情報の変更時に
+    invalidate() で削除され、チャネルが設定されていれば他のワーカーにも通知します。
+
+    DB読み取り中に無効化が起きた場合に古い値を保存しないよう、
+    読み取り前に generation を取得して put() に渡します。
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        channel: Optional[RedisInvalidationChannel] = None
+    ):
+        self.entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.channel = channel
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[AuthenticatedUser]:
+        return self.entries.get(user_id)
+
+    def put(self, user: User, generation: int) -> AuthenticatedUser:
+        """ユーザーを保存（generation 取得後に無効化があった場合は保存しない）"""
+        snapshot = AuthenticatedUser.from_model(user)
+        with self._lock:
+            if generation == self.generation:
+                self.entries.set(user.id, snapshot)
+        return snapshot
+
+    def invalidate(self, user_id: int) -> None:
+        """ユーザーをキャッシュから削除し、他のワーカーに通知"""
+        self._invalidate_local(user_id)
+        if self.channel is not None:
+            self.channel.publish(user_id)
+
+    async def invalidate_async(self, user_id: int) -> None:
+        """invalidate() の非同期版（他のワーカーへの通知はスレッドで行い、イベントループを止めない）"""
+        self._invalidate_local(user_id)
+        if self.channel is not None:
+            await asyncio.to_thread(self.channel.publish, user_id)
+
+    def _invalidate_local(self, user_id: int) -> None:
+        with self._lock:
+            self.generation += 1
+            self.entries.delete(user_id)
+
+    def start(self) -> None:
+        """ワーカー間の無効化通知の購読を開始"""
+        if self.channel is not None:
+            self.channel.start(self._invalidate_local)
+
+    def stop(self) -> None:
+        if self.channel is not None:
+            self.channel.stop()
+
+
+def create_user_cache() -> UserCache:
+    """設定に応じたユーザーキャッシュを生成"""
+    channel = None
+    if settings.user_cache_invalidation == "redis":
+        import redis
+
+        channel = RedisInvalidationChannel(redis.Redis.from_url(settings.redis_url))
+    return UserCache(
+        maxsize=settings.user_cache_max_entries,
+        ttl=settings.user_cache_ttl_seconds,
+        channel=channel,
+    )
+
+
+user_cache = create_user_cache()
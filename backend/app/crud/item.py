@@ -1,9 +1,154 @@
-from typing import Optional
+import re
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import (
+    ARRAY, Delete, Insert, Integer, Select, Update, any_, bindparam, cast, delete, func, insert,
+    literal, select, text, tuple_, update
+)
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
 
-from app.models import Item
+from app.models import Item, TableRowCount, ITEM_SEARCH_CONFIG
+from app.schemas.item import CountMode
 
+# ========================================
+# クエリ定義（同期版・非同期版で共通）
+# ========================================
+
+_ESTIMATED_COUNT_SQL = text(
+    "SELECT CASE WHEN c.reltuples <= 0 OR c.relpages = 0 THEN NULL "
+    "ELSE (c.reltuples / c.relpages "
+    "* (pg_relation_size(c.oid) / current_setting('block_size')::int))::bigint END "
+    "FROM pg_class c WHERE c.oid = CAST(:table_name AS regclass)"
+)
+
+
+def _item_by_id_stmt(item_id: int) -> Select:
+    return select(Item).where(Item.id == item_id)
+
+
+def _item_updated_at_stmt(item_id: int) -> Select:
+    return select(Item.updated_at).where(Item.id == item_id)
+
+
+def _items_page_stmt(
+    skip: int,
+    limit: int,
+    after: Optional[tuple[datetime, int]],
+    columns: Optional[Sequence[Any]] = None
+) -> Select:
+    stmt = select(*columns) if columns else select(Item)
+    stmt = stmt.order_by(Item.created_at.desc(), Item.id.desc())
+    if after is not None:
+        stmt = stmt.where(tuple_(Item.created_at, Item.id) < after)
+    else:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit)
+
+
+def _items_count_stmt() -> Select:
+    return select(func.count(Item.id))
+
+
+def _items_count_cached_stmt() -> Select:
+    return select(TableRowCount.row_count).where(
+        TableRowCount.table_name == Item.__tablename__
+    )
+
+
+def _items_export_stmt(columns: Sequence[Any], updated_since: Optional[datetime]) -> Select:
+    stmt = select(*columns).order_by(Item.id)
+    if updated_since is not None:
+        stmt = stmt.where(Item.updated_at >= updated_since)
+    return stmt
+
+
+def _search_tsquery(q: str) -> Optional[str]:
+    # 入力を単語に分割し、各単語の前方一致をANDで結合する（例: "foo ba" -> "foo:* & ba:*"）
+    # 単語文字のみを使うため、tsquery の演算子として解釈される文字は含まれない
+    terms = re.findall(r"\w+", q.lower())
+    return " & ".join(f"{term}:*" for term in terms) or None
+
+
+def _items_search_stmt(
+    columns: Sequence[Any],
+    q: str,
+    limit: int,
+    after: Optional[tuple[float, int]],
+    fuzzy: bool
+) -> Optional[Select]:
+    # ts_rank / word_similarity は real (float4) を返す。float4 の値はPythonのfloatに
+    # 正確に変換されないため、カーソルに保存したスコアと比較で一致するよう
+    # SELECT・比較・並べ替えのすべてで double precision にキャストして扱う
+    if fuzzy:
+        # タイトルのトライグラム類似検索（q <% title は ix_items_title_trgm で絞り込まれる）
+        score = cast(func.word_similarity(q, Item.title), DOUBLE_PRECISION)
+        condition = literal(q).op("<%")(Item.title)
+    else:
+        tsquery = _search_tsquery(q)
+        if tsquery is None:
+            return None
+        query = func.to_tsquery(ITEM_SEARCH_CONFIG, tsquery)
+        # search_vector @@ query は ix_items_search_vector で絞り込まれる
+        score = cast(func.ts_rank(Item.search_vector, query), DOUBLE_PRECISION)
+        condition = Item.search_vector.bool_op("@@")(query)
+
+    stmt = select(*columns, score).where(condition)
+    if after is not None:
+        stmt = stmt.where(tuple_(score, Item.id) < after)
+    return stmt.order_by(score.desc(), Item.id.desc()).limit(limit)
+
+
+def _update_item_stmt(
+    item_id: int,
+    values: dict[str, Any],
+    expected_updated_at: Optional[Sequence[datetime]]
+) -> Update:
+    # UPDATE items SET ..., updated_at=now() WHERE id = :id [AND updated_at IN (...)] RETURNING *
+    # （updated_at はカラムの onupdate で更新される）
+    stmt = update(Item).where(Item.id == item_id)
+    if expected_updated_at is not None:
+        stmt = stmt.where(Item.updated_at.in_(expected_updated_at))
+    return (
+        stmt.values(**values)
+        .returning(Item)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _delete_item_stmt(item_id: int) -> Delete:
+    return (
+        delete(Item)
+        .where(Item.id == item_id)
+        .returning(Item.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _bulk_insert_stmt() -> Insert:
+    # insertmanyvalues により複数行の INSERT ... VALUES ... RETURNING にまとめて送信される
+    return insert(Item).returning(Item, sort_by_parameter_order=True)
+
+
+def _bulk_delete_stmt(item_ids: Sequence[int]) -> Delete:
+    # IN (...) ではなく配列1つのパラメータで渡す: DELETE ... WHERE id = ANY(:ids)
+    return (
+        delete(Item)
+        .where(Item.id == any_(bindparam("ids", list(item_ids), type_=ARRAY(Integer))))
+        .returning(Item.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _chunks(values: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+# ========================================
+# 同期版
+# ========================================
 
 def create_item(db: Session, title: str, description: Optional[str] = None) -> Item:
     """
@@ -38,26 +183,48 @@ def get_item_by_id(db: Session, item_id: int) -> Optional[Item]:
     Returns:
         Optional[Item]: アイテム、存在しない場合はNone
     """
-    return db.query(Item).filter(Item.id == item_id).first()
+    return db.scalars(_item_by_id_stmt(item_id)).first()
+
+
+def get_item_updated_at(db: Session, item_id: int) -> Optional[datetime]:
+    """
+    アイテムの更新日時のみを取得
+
+    ETagの比較用に、行全体を読み込まずに updated_at だけを取得します。
+
+    Args:
+        db: データベースセッション
+        item_id: アイテムID
+
+    Returns:
+        Optional[datetime]: 更新日時、アイテムが存在しない場合はNone
+    """
+    return db.scalar(_item_updated_at_stmt(item_id))
 
 
 def get_items(
     db: Session,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after: Optional[tuple[datetime, int]] = None
 ) -> list[Item]:
     """
     アイテム一覧を取得
 
+    (created_at, id) の降順で並べます。afterを指定した場合はキーセット
+    ページネーションとなり、ix_items_created_at_id インデックスを使って
+    指定位置の直後から読み始めるため、ページの深さに関係なく一定のコストで取得できます。
+
     Args:
         db: データベースセッション
-        skip: スキップする件数
+        skip: スキップする件数（afterを指定した場合は無視）
         limit: 取得する最大件数
+        after: 直前のページの最後のアイテムの (created_at, id)
 
     Returns:
         list[Item]: アイテムのリスト
     """
-    return db.query(Item).order_by(Item.created_at.desc()).offset(skip).limit(limit).all()
+    return list(db.scalars(_items_page_stmt(skip, limit, after)).all())
 
 
 def get_items_count(db: Session) -> int:
@@ -70,7 +237,66 @@ def get_items_count(db: Session) -> int:
     Returns:
         int: アイテムの総数
     """
-    return db.query(func.count(Item.id)).scalar()
+    return db.scalar(_items_count_stmt())
+
+
+def get_items_count_cached(db: Session) -> Optional[int]:
+    """
+    カウンターテーブルからアイテムの総数を取得
+
+    items テーブルのINSERT/DELETE/TRUNCATEトリガーで更新される正確な件数を
+    主キー検索1回で取得します。
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        Optional[int]: アイテムの総数、カウンターが未作成の場合はNone
+    """
+    return db.scalar(_items_count_cached_stmt())
+
+
+def get_items_count_estimated(db: Session) -> Optional[int]:
+    """
+    プランナー統計からアイテムの総数を推定
+
+    プランナーと同じく、直近のANALYZE時点の1ページあたりの行数に
+    現在のページ数を掛けて推定します。
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        Optional[int]: 推定件数、統計情報が未収集の場合はNone
+    """
+    return db.scalar(_ESTIMATED_COUNT_SQL, {"table_name": Item.__tablename__})
+
+
+def count_items(db: Session, mode: CountMode = CountMode.exact) -> tuple[Optional[int], bool]:
+    """
+    指定された方法でアイテムの総数を取得
+
+    推定値やカウンターが利用できない場合は、より正確な方法にフォールバックします。
+
+    Args:
+        db: データベースセッション
+        mode: 総件数の算出方法
+
+    Returns:
+        tuple[Optional[int], bool]: 総件数（mode=noneの場合はNone）と、推定値かどうか
+    """
+    if mode == CountMode.none:
+        return None, False
+
+    if mode == CountMode.estimated:
+        estimated = get_items_count_estimated(db)
+        if estimated is not None:
+            return estimated, True
+
+    total = get_items_count_cached(db)
+    if total is None:
+        total = get_items_count(db)
+    return total, False
 
 
 def delete_item(db: Session, item_id: int) -> bool:
@@ -84,39 +310,293 @@ def delete_item(db: Session, item_id: int) -> bool:
     Returns:
         bool: 削除に成功した場合True、アイテムが存在しない場合False
     """
-    db_item = db.query(Item).filter(Item.id == item_id).first()
-    if db_item:
-        db.delete(db_item)
-        db.commit()
-        return True
-    return False
+    deleted_id = db.scalar(_delete_item_stmt(item_id))
+    db.commit()
+    return deleted_id is not None
+
+
+def create_items_bulk(
+    db: Session,
+    rows: Sequence[dict[str, Any]],
+    chunk_size: int = 1000
+) -> list[Item]:
+    """
+    アイテムを一括作成
+
+    chunk_size件ごとに INSERT ... RETURNING を実行し、全件を1つのトランザクションで
+    コミットします。途中で失敗した場合はすべてロールバックされます。
+
+    Args:
+        db: データベースセッション
+        rows: title, description を持つ辞書のリスト
+        chunk_size: 1回のINSERT文で送信する件数
+
+    Returns:
+        list[Item]: 作成されたアイテム（rowsと同じ順序）
+    """
+    created: list[Item] = []
+    for chunk in _chunks(rows, chunk_size):
+        created.extend(db.scalars(_bulk_insert_stmt(), list(chunk)).all())
+    db.commit()
+    return created
+
+
+def delete_items_bulk(
+    db: Session,
+    item_ids: Sequence[int],
+    chunk_size: int = 1000
+) -> list[int]:
+    """
+    アイテムを一括削除
+
+    chunk_size件ごとに DELETE ... WHERE id = ANY(...) RETURNING id を実行し、
+    全件を1つのトランザクションでコミットします。
+
+    Args:
+        db: データベースセッション
+        item_ids: 削除するアイテムIDのリスト
+        chunk_size: 1回のDELETE文で送信するID数
+
+    Returns:
+        list[int]: 実際に削除されたアイテムID
+    """
+    deleted: list[int] = []
+    for chunk in _chunks(item_ids, chunk_size):
+        deleted.extend(db.scalars(_bulk_delete_stmt(chunk)).all())
+    db.commit()
+    return deleted
 
 
 def update_item(
     db: Session,
     item_id: int,
-    title: Optional[str] = None,
-    description: Optional[str] = None
+    values: dict[str, Any],
+    expected_updated_at: Optional[Sequence[datetime]] = None
 ) -> Optional[Item]:
     """
     アイテムを更新
 
+    UPDATE ... RETURNING の1文で更新と取得を行います。
+
     Args:
         db: データベースセッション
         item_id: アイテムID
-        title: 新しいタイトル（Noneの場合は更新しない）
-        description: 新しい説明（Noneの場合は更新しない）
+        values: 更新するカラムと値（含まれないカラムは更新しない）
+        expected_updated_at: 指定した場合、updated_at がいずれかに一致する場合のみ更新
 
     Returns:
-        Optional[Item]: 更新されたアイテム、存在しない場合はNone
-    """
-    db_item = db.query(Item).filter(Item.id == item_id).first()
-    if db_item:
-        if title is not None:
-            db_item.title = title
-        if description is not None:
-            db_item.description = description
-        db.commit()
-        db.refresh(db_item)
-        return db_item
-    return None
+        Optional[Item]: 更新されたアイテム、存在しないか updated_at が一致しない場合はNone
+    """
+    db_item = db.scalars(_update_item_stmt(item_id, values, expected_updated_at)).first()
+    db.commit()
+    return db_item
+
+
+# ========================================
+# 非同期版
+#
+# AsyncSession（DATABASE_ASYNC=true）と ThreadedSession（false）の
+# どちらでも動作します。引数と戻り値は同期版と同じです。
+# ========================================
+
+async def create_item_async(
+    db: AsyncSession,
+    title: str,
+    description: Optional[str] = None
+) -> Item:
+    """新しいアイテムを作成（非同期版）"""
+    db_item = Item(
+        title=title,
+        description=description
+    )
+    db.add(db_item)
+    await db.commit()
+    await db.refresh(db_item)
+    return db_item
+
+
+async def get_item_by_id_async(db: AsyncSession, item_id: int) -> Optional[Item]:
+    """IDでアイテムを取得（非同期版）"""
+    return (await db.scalars(_item_by_id_stmt(item_id))).first()
+
+
+async def get_item_updated_at_async(db: AsyncSession, item_id: int) -> Optional[datetime]:
+    """アイテムの更新日時のみを取得（非同期版）"""
+    return await db.scalar(_item_updated_at_stmt(item_id))
+
+
+async def get_items_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[tuple[datetime, int]] = None
+) -> list[Item]:
+    """アイテム一覧を取得（非同期版）"""
+    return list((await db.scalars(_items_page_stmt(skip, limit, after))).all())
+
+
+async def get_items_rows_async(
+    db: AsyncSession,
+    columns: Sequence[Any],
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[tuple[datetime, int]] = None
+) -> list[tuple]:
+    """
+    アイテム一覧を指定列のタプルで取得（非同期版）
+
+    get_items_async と同じ並び順・ページネーションで、ORMオブジェクトを生成せずに
+    必要な列だけを取得します。レスポンスを直接JSONにエンコードする高速パス用です。
+
+    Args:
+        db: データベースセッション
+        columns: 取得する列（例: [Item.id, Item.title]）
+        skip: スキップする件数（afterを指定した場合は無視）
+        limit: 取得する最大件数
+        after: 直前のページの最後のアイテムの (created_at, id)
+
+    Returns:
+        list[tuple]: columns の順に値を並べたタプルのリスト
+    """
+    result = await db.execute(_items_page_stmt(skip, limit, after, columns))
+    return [tuple(row) for row in result.all()]
+
+
+async def search_items_rows_async(
+    db: AsyncSession,
+    columns: Sequence[Any],
+    q: str,
+    limit: int = 100,
+    after: Optional[tuple[float, int]] = None,
+    fuzzy: bool = False
+) -> list[tuple]:
+    """
+    アイテムを検索し、指定列とスコアのタプルで取得（非同期版）
+
+    全文検索では search_vector の前方一致で絞り込み、ts_rank の降順に並べます。
+    fuzzy=True の場合はタイトルのトライグラム類似度 (word_similarity) で検索します。
+    いずれもGINインデックスで候補を絞り込むため、行数が多くても全件走査は行いません。
+
+    Args:
+        db: データベースセッション
+        columns: 取得する列（例: [Item.id, Item.title]）
+        q: 検索文字列
+        limit: 取得する最大件数
+        after: 直前のページの最後のアイテムの (score, id)
+        fuzzy: トライグラム類似検索を行う場合True
+
+    Returns:
+        list[tuple]: columns の順に値を並べ、末尾にスコアを加えたタプルのリスト
+    """
+    stmt = _items_search_stmt(columns, q, limit, after, fuzzy)
+    if stmt is None:
+        return []
+    result = await db.execute(stmt)
+    return [tuple(row) for row in result.all()]
+
+
+async def get_items_count_async(db: AsyncSession) -> int:
+    """アイテムの総数を取得（非同期版）"""
+    return await db.scalar(_items_count_stmt())
+
+
+async def get_items_count_cached_async(db: AsyncSession) -> Optional[int]:
+    """カウンターテーブルからアイテムの総数を取得（非同期版）"""
+    return await db.scalar(_items_count_cached_stmt())
+
+
+async def get_items_count_estimated_async(db: AsyncSession) -> Optional[int]:
+    """プランナー統計からアイテムの総数を推定（非同期版）"""
+    return await db.scalar(_ESTIMATED_COUNT_SQL, {"table_name": Item.__tablename__})
+
+
+async def count_items_async(
+    db: AsyncSession,
+    mode: CountMode = CountMode.exact
+) -> tuple[Optional[int], bool]:
+    """指定された方法でアイテムの総数を取得（非同期版）"""
+    if mode == CountMode.none:
+        return None, False
+
+    if mode == CountMode.estimated:
+        estimated = await get_items_count_estimated_async(db)
+        if estimated is not None:
+            return estimated, True
+
+    total = await get_items_count_cached_async(db)
+    if total is None:
+        total = await get_items_count_async(db)
+    return total, False
+
+
+async def delete_item_async(db: AsyncSession, item_id: int) -> bool:
+    """アイテムを削除（非同期版）"""
+    deleted_id = await db.scalar(_delete_item_stmt(item_id))
+    await db.commit()
+    return deleted_id is not None
+
+
+async def create_items_bulk_async(
+    db: AsyncSession,
+    rows: Sequence[dict[str, Any]],
+    chunk_size: int = 1000
+) -> list[Item]:
+    """アイテムを一括作成（非同期版）"""
+    created: list[Item] = []
+    for chunk in _chunks(rows, chunk_size):
+        created.extend((await db.scalars(_bulk_insert_stmt(), list(chunk))).all())
+    await db.commit()
+    return created
+
+
+async def delete_items_bulk_async(
+    db: AsyncSession,
+    item_ids: Sequence[int],
+    chunk_size: int = 1000
+) -> list[int]:
+    """アイテムを一括削除（非同期版）"""
+    deleted: list[int] = []
+    for chunk in _chunks(item_ids, chunk_size):
+        deleted.extend((await db.scalars(_bulk_delete_stmt(chunk))).all())
+    await db.commit()
+    return deleted
+
+
+async def stream_items_async(
+    db: AsyncSession,
+    columns: Sequence[Any],
+    updated_since: Optional[datetime] = None,
+    batch_size: int = 1000
+) -> AsyncIterator[list[tuple]]:
+    """
+    全アイテムをID順にサーバーサイドカーソルで読み出す
+
+    ORMオブジェクトを生成せず、指定列のタプルを batch_size件ずつ返すため、
+    テーブルの大きさに関係なくメモリ使用量は一定です。
+
+    Args:
+        db: データベースセッション
+        columns: 取得する列（例: [Item.id, Item.title]）
+        updated_since: 指定した場合、この日時以降に更新されたアイテムのみ
+        batch_size: 1回に読み出す件数
+
+    Yields:
+        list[tuple]: columns の順に値を並べたタプルのリスト
+    """
+    stmt = _items_export_stmt(columns, updated_since).execution_options(yield_per=batch_size)
+    result = await db.stream(stmt)
+    async for rows in result.partitions(batch_size):
+        yield [tuple(row) for row in rows]
+
+
+async def update_item_async(
+    db: AsyncSession,
+    item_id: int,
+    values: dict[str, Any],
+    expected_updated_at: Optional[Sequence[datetime]] = None
+) -> Optional[Item]:
+    """アイテムを更新（非同期版）"""
+    result = await db.scalars(_update_item_stmt(item_id, values, expected_updated_at))
+    db_item = result.first()
+    await db.commit()
+    return db_item
@@ -1,22 +1,120 @@
+import asyncio
+import contextvars
+import logging
 from typing import Optional
+from sqlalchemy import Insert, Select, Update, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.database import async_session_scope
 from app.models import User
-from app.core.security import get_password_hash, verify_password
+from app.core.hashing import password_hasher
+from app.core.replica import primary_reads
+from app.core.user_cache import user_cache
 
+logger = logging.getLogger(__name__)
+
+
+class UserAlreadyExistsError(Exception):
+    """メールアドレスまたはユーザー名が登録済みの場合のエラー（field: "email" | "username"）"""
+
+    def __init__(self, field: str):
+        super().__init__(f"User with the same {field} already exists")
+        self.field = field
+
+
+def normalize_email(email: str) -> str:
+    """
+    メールアドレスを正規化（前後の空白を除き小文字にする）
+
+    保存時と検索時の両方で使用し、大文字・小文字の違いで別ユーザーとして扱わないようにします。
+    """
+    return email.strip().lower()
+
+
+def _user_by_email_stmt(email: str) -> Select:
+    # lower(email) の一意インデックス (ix_users_email_lower) を使用する。
+    # 正規化前に登録された大文字を含むメールアドレスも一致する
+    return select(User).where(func.lower(User.email) == normalize_email(email))
+
+
+def _user_by_username_stmt(username: str) -> Select:
+    return select(User).where(User.username == username)
+
+
+def _user_by_id_stmt(user_id: int) -> Select:
+    return select(User).where(User.id == user_id)
+
+
+def _user_conflict_stmt(email: str, username: str) -> Select:
+    # メールアドレスとユーザー名の重複を1回の問い合わせで判定する（一致した行は最大2件）
+    email = normalize_email(email)
+    return (
+        select((func.lower(User.email) == email).label("email_taken"))
+        .where(or_(func.lower(User.email) == email, User.username == username))
+        .limit(2)
+    )
+
+
+def _insert_user_stmt(email: str, username: str, hashed_password: str) -> Insert:
+    # 一意制約に違反する場合はエラーにせず、行を返さない（同時登録の競合もここで検出）
+    return (
+        pg_insert(User)
+        .values(
+            email=normalize_email(email),
+            username=username,
+            hashed_password=hashed_password,
+            is_active=True,
+            is_superuser=False
+        )
+        .on_conflict_do_nothing()
+        .returning(User)
+    )
+
+
+def _conflict_field(email_taken: list[bool]) -> str:
+    """重複した行から、エラーとして返す項目を判定（メールアドレスを優先）"""
+    return "email" if any(email_taken) else "username"
+
+
+def _bump_token_version_stmt(user_id: int) -> Update:
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .returning(User.token_version)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _rehash_password_stmt(user_id: int, old_hash: str, new_hash: str) -> Update:
+    # 検証後にパスワードが変更されていた場合は上書きしない。
+    # 再ハッシュはユーザー情報の変更ではないため updated_at は維持する
+    return (
+        update(User)
+        .where(User.id == user_id, User.hashed_password == old_hash)
+        .values(hashed_password=new_hash, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# ========================================
+# 同期版
+# ========================================
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """メールアドレスでユーザーを取得"""
-    return db.query(User).filter(User.email == email).first()
+    return db.scalars(_user_by_email_stmt(email)).first()
 
 
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     """ユーザー名でユーザーを取得"""
-    return db.query(User).filter(User.username == username).first()
+    return db.scalars(_user_by_username_stmt(username)).first()
 
 
 def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     """IDでユーザーを取得"""
-    return db.query(User).filter(User.id == user_id).first()
+    return db.scalars(_user_by_id_stmt(user_id)).first()
 
 
 def create_user(
@@ -25,18 +123,22 @@ def create_user(
     username: str,
     password: str
 ) -> User:
-    """新しいユーザーを作成"""
-    hashed_password = get_password_hash(password)
-    db_user = User(
-        email=email,
-        username=username,
-        hashed_password=hashed_password,
-        is_active=True,
-        is_superuser=False
-    )
-    db.add(db_user)
+    """
+    新しいユーザーを作成
+
+    メールアドレスまたはユーザー名が登録済みの場合は UserAlreadyExistsError を送出します。
+    """
+    email_taken = db.scalars(_user_conflict_stmt(email, username)).all()
+    if email_taken:
+        raise UserAlreadyExistsError(_conflict_field(email_taken))
+
+    hashed_password = password_hasher.hash_sync(password)
+    db_user = db.scalars(_insert_user_stmt(email, username, hashed_password)).first()
+    if db_user is None:
+        email_taken = db.scalars(_user_conflict_stmt(email, username)).all()
+        db.rollback()
+        raise UserAlreadyExistsError(_conflict_field(email_taken))
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 
@@ -48,9 +150,15 @@ def authenticate_user(
     """ユーザー認証"""
     user = get_user_by_email(db, email=email)
     if not user:
+        # 存在しないユーザーでも同じ時間がかかるようにする
+        password_hasher.verify_dummy_sync(password)
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = password_hasher.verify_and_update_sync(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash is not None:
+        db.execute(_rehash_password_stmt(user.id, user.hashed_password, new_hash))
+        db.commit()
     return user
 
 
@@ -64,9 +172,12 @@ def update_user_password(
     if not user:
         return None
 
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = password_hasher.hash_sync(new_password)
+    # パスワード変更前に発行されたトークンをすべて無効化
+    user.token_version = User.token_version + 1
     db.commit()
     db.refresh(user)
+    user_cache.invalidate(user.id)
     return user
 
 
@@ -77,6 +188,166 @@ def deactivate_user(db: Session, user_id: int) -> Optional[User]:
         return None
 
     user.is_active = False
+    user.token_version = User.token_version + 1
     db.commit()
     db.refresh(user)
+    user_cache.invalidate(user.id)
     return user
+
+
+def revoke_user_tokens(db: Session, user_id: int) -> Optional[int]:
+    """
+    ユーザーの発行済みトークンをすべて無効化
+
+    token_version を増やし、新しい値を返します（ユーザーが存在しない場合は None）。
+    """
+    version = db.scalar(_bump_token_version_stmt(user_id))
+    db.commit()
+    if version is not None:
+        user_cache.invalidate(user_id)
+    return version
+
+
+# ========================================
+# 非同期版
+#
+# AsyncSession（DATABASE_ASYNC=true）と ThreadedSession（false）の
+# どちらでも動作します。bcryptはプロセスプール (password_hasher) で実行します。
+# ========================================
+
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+    """メールアドレスでユーザーを取得（非同期版）"""
+    return (await db.scalars(_user_by_email_stmt(email))).first()
+
+
+async def get_user_by_username_async(db: AsyncSession, username: str) -> Optional[User]:
+    """ユーザー名でユーザーを取得（非同期版）"""
+    return (await db.scalars(_user_by_username_stmt(username))).first()
+
+
+async def get_user_by_id_async(db: AsyncSession, user_id: int) -> Optional[User]:
+    """IDでユーザーを取得（非同期版）"""
+    return (await db.scalars(_user_by_id_stmt(user_id))).first()
+
+
+async def create_user_async(
+    db: AsyncSession,
+    email: str,
+    username: str,
+    password: str
+) -> User:
+    """
+    新しいユーザーを作成（非同期版）
+
+    パスワードのハッシュ化（プロセスプール）を重複チェックと並行して実行し、
+    INSERT ... ON CONFLICT DO NOTHING RETURNING で作成した行をそのまま返します。
+    メールアドレスまたはユーザー名が登録済みの場合（重複チェック後の同時登録を含む）は
+    UserAlreadyExistsError を送出します。
+    """
+    hashing = asyncio.ensure_future(password_hasher.hash(password))
+    # 重複時に結果を待たずに破棄しても、未取得の例外として警告されないようにする
+    hashing.add_done_callback(lambda task: task.cancelled() or task.exception())
+    try:
+        email_taken = (await db.scalars(_user_conflict_stmt(email, username))).all()
+        if email_taken:
+            raise UserAlreadyExistsError(_conflict_field(email_taken))
+        hashed_password = await hashing
+    finally:
+        hashing.cancel()
+
+    db_user = (await db.scalars(_insert_user_stmt(email, username, hashed_password))).first()
+    if db_user is None:
+        email_taken = (await db.scalars(_user_conflict_stmt(email, username))).all()
+        await db.rollback()
+        raise UserAlreadyExistsError(_conflict_field(email_taken))
+    await db.commit()
+    return db_user
+
+
+async def authenticate_user_async(
+    db: AsyncSession,
+    email: str,
+    password: str
+) -> Optional[User]:
+    """ユーザー認証（非同期版）"""
+    # パスワード変更・無効化の直後にレプリカの古いハッシュで認証しないようプライマリから読む
+    with primary_reads():
+        user = await get_user_by_email_async(db, email=email)
+    if not user:
+        # 存在しないユーザーでも同じ時間がかかるようにする
+        await password_hasher.verify_dummy(password)
+        return None
+    valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash is not None:
+        # ハッシュ方式・コストの変更に合わせた再ハッシュの保存はレスポンスを待たせずに行う
+        _schedule_rehash_persist(user.id, user.hashed_password, new_hash)
+    return user
+
+
+# 実行中の再ハッシュ保存タスク（完了前にガベージコレクションされないよう参照を保持）
+_rehash_tasks: set[asyncio.Task] = set()
+
+
+async def _persist_rehashed_password(user_id: int, old_hash: str, new_hash: str) -> None:
+    """再ハッシュしたパスワードを独立したセッションで保存"""
+    try:
+        async with async_session_scope() as db:
+            await db.execute(_rehash_password_stmt(user_id, old_hash, new_hash))
+            await db.commit()
+    except Exception:
+        # 保存できなくても次回のログイン成功時に再度行われる
+        logger.warning("Failed to persist rehashed password for user %s", user_id, exc_info=True)
+
+
+def _schedule_rehash_persist(user_id: int, old_hash: str, new_hash: str) -> None:
+    # リクエストの計測やレプリカのルーティング状態に影響しないよう、空のコンテキストで実行
+    task = asyncio.create_task(
+        _persist_rehashed_password(user_id, old_hash, new_hash),
+        context=contextvars.Context()
+    )
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+
+
+async def update_user_password_async(
+    db: AsyncSession,
+    user_id: int,
+    new_password: str
+) -> Optional[User]:
+    """ユーザーのパスワードを更新（非同期版）"""
+    user = await get_user_by_id_async(db, user_id=user_id)
+    if not user:
+        return None
+
+    user.hashed_password = await password_hasher.hash(new_password)
+    # パスワード変更前に発行されたトークンをすべて無効化
+    user.token_version = User.token_version + 1
+    await db.commit()
+    await db.refresh(user)
+    await user_cache.invalidate_async(user.id)
+    return user
+
+
+async def deactivate_user_async(db: AsyncSession, user_id: int) -> Optional[User]:
+    """ユーザーを無効化（非同期版）"""
+    user = await get_user_by_id_async(db, user_id=user_id)
+    if not user:
+        return None
+
+    user.is_active = False
+    user.token_version = User.token_version + 1
+    await db.commit()
+    await db.refresh(user)
+    await user_cache.invalidate_async(user.id)
+    return user
+
+
+async def revoke_user_tokens_async(db: AsyncSession, user_id: int) -> Optional[int]:
+    """ユーザーの発行済みトークンをすべて無効化（非同期版）"""
+    version = await db.scalar(_bump_token_version_stmt(user_id))
+    await db.commit()
+    if version is not None:
+        await user_cache.invalidate_async(user_id)
+    return version
@@ -1,8 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Computed, Integer, BigInteger, String, DateTime, Boolean, Text, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.database import Base
 
 
+# 全文検索のテキスト検索設定（言語依存の語幹処理を行わない）
+ITEM_SEARCH_CONFIG = "simple"
+
+
 class User(Base):
     """
     ユーザーモデル
@@ -17,9 +23,16 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     is_superuser = Column(Boolean, default=False, nullable=False)
+    # JWTの ver クレームと比較する世代番号。増やすと発行済みの全トークンが無効になる
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # 大文字・小文字を区別しないメールアドレスの一意性と検索用 (lower(email) = :email)
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+    )
+
     def __repr__(self):
         return f"<User(id={self.id}, username={self.username}, email={self.email})>"
 
@@ -37,6 +50,41 @@ class Item(Base):
     description = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # 全文検索用の生成列（タイトルを説明より高く重み付け）。通常のSELECTでは読み込まない
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{ITEM_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{ITEM_SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
+
+    __table_args__ = (
+        # 一覧のキーセットページネーション用 (ORDER BY created_at DESC, id DESC)
+        Index("ix_items_created_at_id", "created_at", "id"),
+        # 検索用 (search_vector @@ tsquery / タイトルのトライグラム類似検索)
+        Index("ix_items_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_items_title_trgm", "title",
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}
+        ),
+    )
 
     def __repr__(self):
         return f"<Item(id={self.id}, title={self.title})>"
+
+
+class TableRowCount(Base):
+    """
+    テーブル行数カウンターモデル
+
+    対象テーブルのトリガーで増減され、COUNT(*) を実行せずに正確な件数を返すために使用
+    """
+    __tablename__ = "table_row_counts"
+
+    table_name = Column(String(63), primary_key=True)
+    row_count = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableRowCount(table_name={self.table_name}, row_count={self.row_count})>"
@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends
+
+from app.core.cache import LRUCache
+from app.core.deps import get_current_superuser
+from app.core.pool import pool_status
+from app.core.security import token_cache
+from app.core.user_cache import user_cache
+from app.database import engine, async_engine
+from app.schemas.admin import (
+    PoolStatusResponse,
+    PoolStatsResponse,
+    CacheStatsResponse,
+    CacheStatsListResponse
+)
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    dependencies=[Depends(get_current_superuser)]
+)
+
+
+@router.get("/pool", response_model=PoolStatsResponse)
+async def get_pool_stats():
+    """
+    コネクションプール状態取得エンドポイント
+
+    スーパーユーザー専用。エンジンごとの使用中・待機中・オーバーフロー接続数と
+    チェックアウト待ち時間（起動からの累計）を返します。プールサイズの調整に使用します。
+
+    レスポンス (camelCase):
+    ```json
+    {
+        "pools": [
+            {
+                "name": "async",
+                "size": 5,
+                "checkedIn": 3,
+                "checkedOut": 2,
+                "overflow": 0,
+                "maxOverflow": 10,
+                "checkouts": 1520,
+                "checkoutTimeouts": 0,
+                "avgWaitMs": 0.12,
+                "maxWaitMs": 35.4
+            }
+        ]
+    }
+    ```
+    """
+    pools = [PoolStatusResponse(name="sync", **pool_status(engine.pool))]
+    if async_engine is not None:
+        pools.append(PoolStatusResponse(name="async", **pool_status(async_engine.pool)))
+    return PoolStatsResponse(pools=pools)
+
+
+def _cache_stats(name: str, cache: LRUCache) -> CacheStatsResponse:
+    lookups = cache.hits + cache.misses
+    return CacheStatsResponse(
+        name=name,
+        size=len(cache),
+        max_size=cache.maxsize,
+        hits=cache.hits,
+        misses=cache.misses,
+        hit_rate=cache.hits / lookups if lookups else 0.0
+    )
+
+
+@router.get("/caches", response_model=CacheStatsListResponse)
+async def get_cache_stats():
+    """
+    プロセス内キャッシュ統計取得エンドポイント
+
+    スーパーユーザー専用。検証済みJWTと認証済みユーザーのキャッシュについて、
+    起動からのヒット数・ミス数を返します（ワーカープロセスごとの値）。
+
+    レスポンス (camelCase):
+    ```json
+    {
+        "caches": [
+            {
+                "name": "token",
+                "size": 120,
+                "maxSize": 10000,
+                "hits": 5230,
+                "misses": 140,
+                "hitRate": 0.974
+            }
+        ]
+    }
+    ```
+    """
+    return CacheStatsListResponse(caches=[
+        _cache_stats("token", token_cache),
+        _cache_stats("user", user_cache.entries),
+    ])
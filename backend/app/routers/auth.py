@@ -1,16 +1,32 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
-
-from app.core.deps import get_db, get_current_active_user
-from app.core.security import create_access_token, create_refresh_token
+from typing import Optional, Union
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Request, status, Response
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import (
+    get_db,
+    get_current_active_user,
+    load_authenticated_user,
+    security
+)
+from app.core.rate_limit import login_rate_limiter
+from app.core.revocation import revocation_store
+from app.core.security import (
+    REFRESH_TOKEN_TYPE,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    token_ttl
+)
 from app.core.config import settings
+from app.core.user_cache import AuthenticatedUser
 from app.crud.user import (
-    get_user_by_email,
-    get_user_by_username,
-    create_user,
-    authenticate_user
+    UserAlreadyExistsError,
+    create_user_async,
+    authenticate_user_async,
+    revoke_user_tokens_async
 )
+from app.models import User
 from app.schemas.auth import (
     UserRegisterRequest,
     UserLoginRequest,
@@ -20,16 +36,54 @@ from app.schemas.auth import (
     RefreshTokenRequest,
     MessageResponse
 )
-from app.models import User
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
+# 登録時に重複した項目ごとのエラーメッセージ
+REGISTER_CONFLICT_DETAILS = {
+    "email": "Email already registered",
+    "username": "Username already taken",
+}
+
+
+def _issue_tokens(user: Union[User, AuthenticatedUser]) -> tuple[str, str]:
+    """アクセストークンとリフレッシュトークンを生成（ver にユーザーの token_version を設定）"""
+    claims = {"sub": str(user.id), "ver": user.token_version}
+    return create_access_token(data=claims), create_refresh_token(data=claims)
+
+
+def _set_token_cookies(response: Response, access_token: str, refresh_token: str) -> None:
+    """HttpOnly Cookieにトークンをセット（SSR対応）"""
+    response.set_cookie(
+        key="access_token",
+        value=access_token,
+        httponly=True,  # JavaScriptからアクセス不可（XSS対策）
+        secure=settings.environment == "production",  # 本番環境ではHTTPSのみ
+        samesite="lax",  # CSRF対策
+        max_age=settings.access_token_expire_minutes * 60,  # 秒単位
+    )
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        httponly=True,
+        secure=settings.environment == "production",
+        samesite="lax",
+        max_age=settings.refresh_token_expire_days * 24 * 60 * 60,
+    )
+
+
+async def _revoke_token(token: str) -> None:
+    """トークンの jti を有効期限まで失効させる（不正なトークンは無視）"""
+    payload = decode_token(token)
+    if payload is not None and payload.get("jti"):
+        await revocation_store.revoke(payload["jti"], token_ttl(payload))
+
 
 @router.post("/register", response_model=UserWithTokenResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     request: UserRegisterRequest,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     ユーザー登録エンドポイント
@@ -63,51 +117,23 @@ def register(
 
     注: トークンはHttpOnly Cookieにもセットされます（SSR対応）
     """
-    # メールアドレスの重複チェック
-    existing_user = get_user_by_email(db, email=request.email)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
+    # ユーザー作成（メールアドレス・ユーザー名の重複は1回の問い合わせで判定）
+    try:
+        user = await create_user_async(
+            db=db,
+            email=request.email,
+            username=request.username,
+            password=request.password
         )
-
-    # ユーザー名の重複チェック
-    existing_username = get_user_by_username(db, username=request.username)
-    if existing_username:
+    except UserAlreadyExistsError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken"
+            detail=REGISTER_CONFLICT_DETAILS[exc.field]
         )
 
-    # ユーザー作成
-    user = create_user(
-        db=db,
-        email=request.email,
-        username=request.username,
-        password=request.password
-    )
-
     # トークン生成
-    access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
-
-    # HttpOnly Cookieにトークンをセット（SSR対応）
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,  # JavaScriptからアクセス不可（XSS対策）
-        secure=settings.environment == "production",  # 本番環境ではHTTPSのみ
-        samesite="lax",  # CSRF対策
-        max_age=settings.access_token_expire_minutes * 60,  # 秒単位
-    )
-    response.set_cookie(
-        key="refresh_token",
-        value=refresh_token,
-        httponly=True,
-        secure=settings.environment == "production",
-        samesite="lax",
-        max_age=settings.refresh_token_expire_days * 24 * 60 * 60,
-    )
+    access_token, refresh_token = _issue_tokens(user)
+    _set_token_cookies(response, access_token, refresh_token)
 
     return UserWithTokenResponse(
         user=UserResponse.model_validate(user),
@@ -118,15 +144,17 @@ def register(
 
 
 @router.post("/login", response_model=UserWithTokenResponse)
-def login(
+async def login(
     request: UserLoginRequest,
     response: Response,
-    db: Session = Depends(get_db)
+    http_request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     ログインエンドポイント
 
     メールアドレスとパスワードで認証し、トークンをHttpOnly Cookieにセットします。
+    試行回数は送信元IPアドレスとメールアドレスごとに制限され、超過した場合は429を返します。
 
     フロントエンド送信データ (camelCase):
     ```json
@@ -153,8 +181,14 @@ def login(
 
     注: トークンはHttpOnly Cookieにもセットされます（SSR対応）
     """
+    # レート制限（データベースへの問い合わせとbcryptの前に判定）
+    # プロキシ経由の場合、client.host は SERVER_FORWARDED_ALLOW_IPS で信頼したプロキシが
+    # 付与した X-Forwarded-For のクライアントのアドレス（未設定だと全員がプロキシのアドレスになる）
+    client_ip = http_request.client.host if http_request.client else "unknown"
+    await login_rate_limiter.check(client_ip, request.email)
+
     # ユーザー認証
-    user = authenticate_user(db, email=request.email, password=request.password)
+    user = await authenticate_user_async(db, email=request.email, password=request.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -170,26 +204,8 @@ def login(
         )
 
     # トークン生成
-    access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
-
-    # HttpOnly Cookieにトークンをセット（SSR対応）
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        secure=settings.environment == "production",
-        samesite="lax",
-        max_age=settings.access_token_expire_minutes * 60,
-    )
-    response.set_cookie(
-        key="refresh_token",
-        value=refresh_token,
-        httponly=True,
-        secure=settings.environment == "production",
-        samesite="lax",
-        max_age=settings.refresh_token_expire_days * 24 * 60 * 60,
-    )
+    access_token, refresh_token = _issue_tokens(user)
+    _set_token_cookies(response, access_token, refresh_token)
 
     return UserWithTokenResponse(
         user=UserResponse.model_validate(user),
@@ -200,14 +216,18 @@ def login(
 
 
 @router.post("/refresh", response_model=TokenResponse)
-def refresh_token(
+async def refresh_token(
     request: RefreshTokenRequest,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     トークンリフレッシュエンドポイント
 
-    リフレッシュトークンから新しいアクセストークンを発行します。
+    リフレッシュトークンから新しいアクセストークンとリフレッシュトークンを発行します。
+    使用したリフレッシュトークンは失効し（ローテーション）、再度使用された場合は
+    漏洩とみなしてユーザーの全トークンを無効化します。
+    ユーザーはキャッシュから取得するため、通常はデータベースへの問い合わせは発生しません。
 
     フロントエンド送信データ (camelCase):
     ```json
@@ -220,58 +240,64 @@ def refresh_token(
     ```json
     {
         "accessToken": "eyJ...",
+        "refreshToken": "eyJ...",
         "tokenType": "bearer"
     }
     ```
+
+    注: 新しいトークンはHttpOnly Cookieにもセットされます
     """
-    from app.core.security import decode_token
+    invalid_token_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
     # リフレッシュトークンの検証
     payload = decode_token(request.refresh_token)
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid refresh token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if payload is None or payload.get("type") != REFRESH_TOKEN_TYPE or not payload.get("jti"):
+        raise invalid_token_exception
 
     user_id: Optional[int] = payload.get("sub")
     if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid refresh token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise invalid_token_exception
 
     try:
         user_id = int(user_id)
     except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid refresh token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise invalid_token_exception
 
     # ユーザー存在確認
-    from app.crud.user import get_user_by_id
-    user = get_user_by_id(db, user_id=user_id)
+    user = await load_authenticated_user(db, user_id)
     if user is None or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive"
         )
 
-    # 新しいアクセストークンを生成
-    access_token = create_access_token(data={"sub": str(user.id)})
+    # パスワード変更・全セッションのログアウト前に発行されたトークン
+    if payload.get("ver", 0) != user.token_version:
+        raise invalid_token_exception
+
+    # 使用済みとして記録（同時に同じトークンが使われた場合も成功するのは1件のみ）
+    # すでに使用済み・ログアウト済みのトークンは漏洩とみなし、ユーザーの全トークンを無効化する
+    if not await revocation_store.revoke(payload["jti"], token_ttl(payload)):
+        await revoke_user_tokens_async(db, user_id)
+        raise invalid_token_exception
+
+    # 新しいトークンを生成
+    access_token, refresh_token = _issue_tokens(user)
+    _set_token_cookies(response, access_token, refresh_token)
 
     return TokenResponse(
         access_token=access_token,
+        refresh_token=refresh_token,
         token_type="bearer"
     )
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_active_user)):
+async def get_me(current_user: AuthenticatedUser = Depends(get_current_active_user)):
     """
     現在のユーザー情報を取得
 
@@ -298,10 +324,16 @@ def get_me(current_user: User = Depends(get_current_active_user)):
 
 
 @router.post("/logout", response_model=MessageResponse)
-def logout(response: Response):
+async def logout(
+    response: Response,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    access_token: Optional[str] = Cookie(None),
+    refresh_token_cookie: Optional[str] = Cookie(None, alias="refresh_token")
+):
     """
     ログアウトエンドポイント
 
+    送信されたアクセストークンとリフレッシュトークンを失効させ、
     HttpOnly Cookieからトークンを削除します。
 
     レスポンス (camelCase):
@@ -311,8 +343,39 @@ def logout(response: Response):
     }
     ```
     """
+    # トークンの失効（Authorizationヘッダー優先、次にCookie）
+    for token in (credentials.credentials if credentials else access_token, refresh_token_cookie):
+        if token:
+            await _revoke_token(token)
+
     # Cookieを削除
     response.delete_cookie(key="access_token", samesite="lax")
     response.delete_cookie(key="refresh_token", samesite="lax")
 
     return MessageResponse(message="Successfully logged out")
+
+
+@router.post("/logout-all", response_model=MessageResponse)
+async def logout_all(
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    全セッションのログアウトエンドポイント
+
+    ユーザーの token_version を増やし、すべての端末で発行済みのトークンを無効化します。
+
+    レスポンス (camelCase):
+    ```json
+    {
+        "message": "Successfully logged out from all sessions"
+    }
+    ```
+    """
+    await revoke_user_tokens_async(db, current_user.id)
+
+    response.delete_cookie(key="access_token", samesite="lax")
+    response.delete_cookie(key="refresh_token", samesite="lax")
+
+    return MessageResponse(message="Successfully logged out from all sessions")
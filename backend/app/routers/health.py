@@ -0,0 +1,116 @@
+import asyncio
+import time
+from typing import Union
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.database import engine, async_engine, replica_engines, async_replica_engines
+from app.schemas.health import DatabaseCheckResponse, PoolCheckResponse, ReadinessResponse
+
+router = APIRouter(tags=["health"])
+
+_SELECT_ONE = text("SELECT 1")
+
+
+def _select_one_sync(target: Engine) -> None:
+    with target.connect() as conn:
+        conn.execute(_SELECT_ONE)
+
+
+async def _select_one(target: Union[Engine, AsyncEngine]) -> None:
+    if isinstance(target, AsyncEngine):
+        async with target.connect() as conn:
+            await conn.execute(_SELECT_ONE)
+    else:
+        await run_in_threadpool(_select_one_sync, target)
+
+
+async def _probe(name: str, target: Union[Engine, AsyncEngine]) -> DatabaseCheckResponse:
+    """プール経由で SELECT 1 を実行し、応答時間を計測（タイムアウト付き）"""
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(_select_one(target), timeout=settings.ready_timeout_seconds)
+    except asyncio.TimeoutError:
+        return DatabaseCheckResponse(name=name, ok=False, error="timeout")
+    except Exception as e:
+        # 接続先の情報を含む可能性があるため、例外の種類のみを返す
+        return DatabaseCheckResponse(name=name, ok=False, error=type(e).__name__)
+    return DatabaseCheckResponse(
+        name=name,
+        ok=True,
+        latency_ms=round((time.perf_counter() - start) * 1000, 2)
+    )
+
+
+def _pool_check() -> PoolCheckResponse:
+    """リクエスト処理に使用するプール（非同期モードでは非同期エンジン）の使用率"""
+    pool = (async_engine or engine).pool
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    utilization = checked_out / capacity if capacity else 1.0
+    return PoolCheckResponse(
+        checked_out=checked_out,
+        capacity=capacity,
+        utilization=round(utilization, 3),
+        saturated=utilization >= settings.ready_pool_saturation
+    )
+
+
+@router.get("/health")
+async def health_check():
+    """
+    ヘルスチェック（ライブネスプローブ）エンドポイント
+
+    プロセスが応答できることのみを確認します。DBの障害でプロセスが再起動されないよう、
+    依存先の確認は /ready で行います。
+    """
+    return {"status": "healthy"}
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+async def readiness_check():
+    """
+    レディネスプローブエンドポイント
+
+    コネクションプールの使用率と、プライマリ・各リードレプリカへの SELECT 1 の応答時間を返します。
+    プールが飽和している（使用率が READY_POOL_SATURATION 以上）、またはいずれかのDBが
+    READY_TIMEOUT_SECONDS 以内に応答しない場合は 503 を返し、ロードバランサーに
+    このPodへの振り分けを止めさせます。
+
+    プールが飽和している場合は、接続の空き待ちを避けるためDBへの確認を行いません。
+
+    レスポンス (camelCase):
+    ```json
+    {
+        "status": "ready",
+        "pool": {"checkedOut": 4, "capacity": 15, "utilization": 0.267, "saturated": false},
+        "databases": [{"name": "primary", "ok": true, "latencyMs": 1.2, "error": null}]
+    }
+    ```
+    """
+    pool = _pool_check()
+    databases: list[DatabaseCheckResponse] = []
+    if not pool.saturated:
+        replicas = async_replica_engines if async_engine is not None else replica_engines
+        targets = {"primary": async_engine or engine}
+        targets.update({f"replica{i}": replica for i, replica in enumerate(replicas, start=1)})
+        databases = list(await asyncio.gather(
+            *(_probe(name, target) for name, target in targets.items())
+        ))
+
+    ready = not pool.saturated and all(check.ok for check in databases)
+    body = ReadinessResponse(
+        status="ready" if ready else "unavailable",
+        pool=pool,
+        databases=databases
+    )
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=body.model_dump(mode="json", by_alias=True)
+    )
@@ -1,28 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import response_cache
+from app.core.config import settings
 from app.core.deps import get_db
+from app.core.export import ndjson_stream, csv_stream
+from app.core.etag import (
+    item_etag, item_versions_from_if_match, body_etag, etag_matches, not_modified, json_response
+)
+from app.core.pagination import (
+    encode_cursor, decode_cursor, encode_search_cursor, decode_search_cursor
+)
+from app.core.serialization import RowEncoder, dumps, serialization_keys
+from app.database import async_session_scope
 from app.crud.item import (
-    create_item,
-    get_item_by_id,
-    get_items,
-    get_items_count,
-    delete_item,
-    update_item
+    create_item_async,
+    get_item_by_id_async,
+    get_item_updated_at_async,
+    get_items_async,
+    count_items_async,
+    delete_item_async,
+    update_item_async,
+    create_items_bulk_async,
+    delete_items_bulk_async,
+    get_items_rows_async,
+    search_items_rows_async,
+    stream_items_async
 )
+from app.models import Item
 from app.schemas.item import (
     ItemCreateRequest,
+    ItemUpdateRequest,
     ItemResponse,
-    ItemListResponse
+    ItemListResponse,
+    ItemSearchResponse,
+    CountMode,
+    ItemBulkCreateRequest,
+    ItemBulkCreateResponse,
+    ItemBulkDeleteRequest,
+    ItemBulkDeleteResponse,
+    ItemBulkError,
+    ExportFormat
 )
 
 router = APIRouter(prefix="/api/items", tags=["items"])
 
+# レスポンスキャッシュのタグ（フロントエンドの cacheTag('items') に対応）
+CACHE_TAG = "items"
+
+# ItemResponse のフィールド順に取得する列と、そのJSONキー（高速パス・エクスポート用）
+item_encoder = RowEncoder(ItemResponse)
+ITEM_COLUMNS = [getattr(Item, name) for name in item_encoder.fields]
+ITEM_ID_INDEX = item_encoder.fields.index("id")
+ITEM_CREATED_AT_INDEX = item_encoder.fields.index("created_at")
+LIST_KEYS = dict(zip(ItemListResponse.model_fields, serialization_keys(ItemListResponse)))
+SEARCH_KEYS = dict(zip(ItemSearchResponse.model_fields, serialization_keys(ItemSearchResponse)))
+
 
 @router.post("", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
-def create_new_item(
+async def create_new_item(
     request: ItemCreateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     アイテム作成エンドポイント
@@ -48,28 +90,294 @@ def create_new_item(
     }
     ```
     """
-    item = create_item(
+    item = await create_item_async(
         db=db,
         title=request.title,
         description=request.description
     )
+    await response_cache.invalidate(CACHE_TAG)
     return ItemResponse.model_validate(item)
 
 
+def _check_bulk_size(count: int) -> None:
+    if count > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many items (max {settings.bulk_max_items})"
+        )
+
+
+@router.post("/bulk", response_model=ItemBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_items_in_bulk(
+    request: ItemBulkCreateRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    アイテム一括作成エンドポイント
+
+    複数のアイテムを1つのトランザクションで作成します。
+    BULK_CHUNK_SIZE件ごとに INSERT ... RETURNING を1回実行します。
+    検証エラーの要素は errors に位置 (index) とともに返し、残りの要素は作成します。
+
+    フロントエンド送信データ (camelCase):
+    ```json
+    {
+        "items": [
+            {"title": "Item 1", "description": "First item"},
+            {"title": ""}
+        ]
+    }
+    ```
+
+    レスポンス (camelCase):
+    ```json
+    {
+        "items": [
+            {
+                "id": 1,
+                "title": "Item 1",
+                "description": "First item",
+                "createdAt": "2025-11-10T00:00:00Z",
+                "updatedAt": "2025-11-10T00:00:00Z"
+            }
+        ],
+        "errors": [
+            {"index": 1, "detail": "title: String should have at least 1 character"}
+        ]
+    }
+    ```
+    """
+    _check_bulk_size(len(request.items))
+
+    rows = []
+    errors = []
+    for index, raw in enumerate(request.items):
+        try:
+            item = ItemCreateRequest.model_validate(raw)
+        except ValidationError as e:
+            detail = "; ".join(
+                f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            )
+            errors.append(ItemBulkError(index=index, detail=detail))
+            continue
+        rows.append({"title": item.title, "description": item.description})
+
+    items = []
+    if rows:
+        items = await create_items_bulk_async(
+            db=db,
+            rows=rows,
+            chunk_size=settings.bulk_chunk_size
+        )
+        await response_cache.invalidate(CACHE_TAG)
+
+    return ItemBulkCreateResponse(
+        items=[ItemResponse.model_validate(item) for item in items],
+        errors=errors
+    )
+
+
+@router.delete("/bulk", response_model=ItemBulkDeleteResponse)
+async def delete_items_in_bulk(
+    request: ItemBulkDeleteRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    アイテム一括削除エンドポイント
+
+    指定されたIDのアイテムを1つのトランザクションで削除します。
+    BULK_CHUNK_SIZE件ごとに DELETE ... WHERE id = ANY(...) RETURNING id を1回実行します。
+    存在しなかったIDは notFoundIds に返します。
+
+    フロントエンド送信データ:
+    ```json
+    {
+        "ids": [1, 2, 3]
+    }
+    ```
+
+    レスポンス (camelCase):
+    ```json
+    {
+        "deletedIds": [1, 2],
+        "notFoundIds": [3]
+    }
+    ```
+    """
+    item_ids = list(dict.fromkeys(request.ids))
+    _check_bulk_size(len(item_ids))
+
+    deleted = await delete_items_bulk_async(
+        db=db,
+        item_ids=item_ids,
+        chunk_size=settings.bulk_chunk_size
+    )
+    if deleted:
+        await response_cache.invalidate(CACHE_TAG)
+
+    deleted_set = set(deleted)
+    return ItemBulkDeleteResponse(
+        deleted_ids=[item_id for item_id in item_ids if item_id in deleted_set],
+        not_found_ids=[item_id for item_id in item_ids if item_id not in deleted_set]
+    )
+
+
+@router.get("/export")
+async def export_items(
+    format: ExportFormat = ExportFormat.ndjson,
+    updated_since: Optional[datetime] = None,
+    batch_size: int = 1000
+):
+    """
+    アイテムエクスポートエンドポイント
+
+    全アイテムをID順にストリーミングで返します。サーバーサイドカーソルで
+    batch_size件ずつ読み出しながら送信するため、テーブルの大きさに関係なく
+    メモリ使用量は一定です。
+
+    クエリパラメータ:
+    - format: 出力形式 ndjson | csv（デフォルト: ndjson）
+    - updated_since: 指定した日時以降に更新されたアイテムのみ（差分同期用）
+    - batch_size: 1回に読み出す件数（デフォルト: 1000）
+
+    レスポンス (ndjson):
+    ```
+    {"id": 1, "title": "Sample Item", "description": "This is a sample item", "createdAt": "2025-11-10T00:00:00Z", "updatedAt": "2025-11-10T00:00:00Z"}
+    ```
+    """
+    if not 1 <= batch_size <= 10000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="batch_size must be between 1 and 10000"
+        )
+
+    # レスポンス送信中もセッションを保持するため、依存性ではなくジェネレーター内で開く
+    async def batches():
+        async with async_session_scope() as db:
+            async for rows in stream_items_async(db, ITEM_COLUMNS, updated_since, batch_size):
+                yield rows
+
+    if format == ExportFormat.csv:
+        return StreamingResponse(
+            csv_stream(item_encoder.keys, batches()),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="items.csv"'}
+        )
+    return StreamingResponse(
+        ndjson_stream(item_encoder.keys, batches()),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/search", response_model=ItemSearchResponse)
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    アイテム検索エンドポイント
+
+    タイトルと説明を全文検索し、関連度の高い順に返します。各単語は前方一致で検索され、
+    タイトルでの一致は説明での一致より上位になります。
+    全文検索で1件も一致しない場合は、タイトルのトライグラム類似検索（表記揺れ・タイプミス対応）
+    の結果を返し、fuzzy を true にします。
+
+    クエリパラメータ:
+    - q: 検索文字列
+    - limit: 取得する最大件数（1〜100、デフォルト: 20）
+    - cursor: 前のレスポンスの nextCursor
+
+    レスポンスはクエリパラメータごとにキャッシュされ、アイテムの作成・更新・削除時に無効化されます。
+
+    レスポンス (camelCase):
+    ```json
+    {
+        "items": [
+            {
+                "id": 1,
+                "title": "Sample Item",
+                "description": "This is a sample item",
+                "createdAt": "2025-11-10T00:00:00Z",
+                "updatedAt": "2025-11-10T00:00:00Z"
+            }
+        ],
+        "fuzzy": false,
+        "nextCursor": "WzAsMC4wNjA3OTI3MSwxXQ"
+    }
+    ```
+    """
+    cache_key = await response_cache.key(CACHE_TAG, "search", limit, cursor, q)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached.body, cached.etag, if_none_match)
+
+    fuzzy, after = False, None
+    if cursor:
+        try:
+            fuzzy, score, item_id = decode_search_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        after = (score, item_id)
+
+    with response_cache.filling():
+        rows = await search_items_rows_async(
+            db=db, columns=ITEM_COLUMNS, q=q, limit=limit, after=after, fuzzy=fuzzy
+        )
+        if not rows and after is None and not fuzzy:
+            fuzzy = True
+            rows = await search_items_rows_async(
+                db=db, columns=ITEM_COLUMNS, q=q, limit=limit, fuzzy=True
+            )
+
+    next_cursor = None
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_search_cursor(fuzzy, last[-1], last[ITEM_ID_INDEX])
+
+    # 各行の末尾のスコアは item_encoder のキー数を超えるため出力されない
+    body = dumps({
+        SEARCH_KEYS["items"]: item_encoder.to_dicts(rows),
+        SEARCH_KEYS["fuzzy"]: fuzzy,
+        SEARCH_KEYS["next_cursor"]: next_cursor,
+    })
+    etag = body_etag(body)
+    await response_cache.set(cache_key, body, etag)
+    return json_response(body, etag, if_none_match)
+
+
 @router.get("", response_model=ItemListResponse)
-def get_items_list(
+async def get_items_list(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    count: CountMode = CountMode.exact,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     アイテム一覧取得エンドポイント
 
     アイテムの一覧を取得します（ページネーション対応）。
+    レスポンスはクエリパラメータごとにキャッシュされ、アイテムの作成・削除時に無効化されます。
 
     クエリパラメータ:
     - skip: スキップする件数（デフォルト: 0）
     - limit: 取得する最大件数（デフォルト: 100）
+    - cursor: 前のレスポンスの nextCursor（指定時はskipを無視してキーセットページネーション）
+    - count: 総件数の算出方法 exact | estimated | none（デフォルト: exact）
+
+    深いページを読む場合は skip ではなく cursor を使用してください。
+    cursor はページの深さに関係なく一定のコストで次のページを取得できます。
+
+    レスポンスにはボディのハッシュから算出したETagが付与されます。
+    If-None-Match が一致する場合は 304 Not Modified を返します。
 
     レスポンス (camelCase):
     ```json
@@ -83,28 +391,106 @@ def get_items_list(
                 "updatedAt": "2025-11-10T00:00:00Z"
             }
         ],
-        "total": 1
+        "total": 1,
+        "totalEstimated": false,
+        "nextCursor": "WyIyMDI1LTExLTEwVDAwOjAwOjAwKzAwOjAwIiwxXQ"
     }
     ```
     """
-    items = get_items(db=db, skip=skip, limit=limit)
-    total = get_items_count(db=db)
+    cache_key = await response_cache.key(CACHE_TAG, "list", skip, limit, cursor, count.value)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached.body, cached.etag, if_none_match)
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+    with response_cache.filling():
+        if settings.items_fast_path:
+            body = await _build_items_list_fast(db, skip, limit, after, count)
+        else:
+            body = await _build_items_list(db, skip, limit, after, count)
+    etag = body_etag(body)
+    await response_cache.set(cache_key, body, etag)
+    return json_response(body, etag, if_none_match)
+
+
+async def _build_items_list(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    after: Optional[tuple[datetime, int]],
+    count: CountMode
+) -> bytes:
+    """ORMオブジェクトとPydanticモデルを経由して一覧のJSONを生成"""
+    items = await get_items_async(db=db, skip=skip, limit=limit, after=after)
+    total, total_estimated = await count_items_async(db=db, mode=count)
+
+    # 取得件数がlimitに満たない場合は最終ページ
+    next_cursor = None
+    if items and len(items) == limit:
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
 
     return ItemListResponse(
         items=[ItemResponse.model_validate(item) for item in items],
-        total=total
+        total=total,
+        total_estimated=total_estimated,
+        next_cursor=next_cursor
+    ).model_dump_json(by_alias=True).encode()
+
+
+async def _build_items_list_fast(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    after: Optional[tuple[datetime, int]],
+    count: CountMode
+) -> bytes:
+    """
+    必要な列をタプルで取得し、モデルを生成せずにorjsonで一覧のJSONを生成
+
+    出力は _build_items_list と同じキー名・順序になります。
+    """
+    rows = await get_items_rows_async(
+        db=db, columns=ITEM_COLUMNS, skip=skip, limit=limit, after=after
     )
+    total, total_estimated = await count_items_async(db=db, mode=count)
+
+    next_cursor = None
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(last[ITEM_CREATED_AT_INDEX], last[ITEM_ID_INDEX])
+
+    return dumps({
+        LIST_KEYS["items"]: item_encoder.to_dicts(rows),
+        LIST_KEYS["total"]: total,
+        LIST_KEYS["total_estimated"]: total_estimated,
+        LIST_KEYS["next_cursor"]: next_cursor,
+    })
 
 
 @router.get("/{item_id}", response_model=ItemResponse)
-def get_item(
+async def get_item(
     item_id: int,
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     アイテム詳細取得エンドポイント
 
     指定されたIDのアイテムを取得します。
+    レスポンスはキャッシュされ、アイテムの作成・削除時に無効化されます。
+
+    レスポンスには (id, updatedAt) から算出したETagが付与されます。
+    If-None-Match が指定された場合は updated_at のみを取得して比較し、
+    一致すれば行全体を読み込まずに 304 Not Modified を返します。
 
     レスポンス (camelCase):
     ```json
@@ -117,29 +503,97 @@ def get_item(
     }
     ```
     """
-    item = get_item_by_id(db=db, item_id=item_id)
+    cache_key = await response_cache.key(CACHE_TAG, "detail", item_id)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached.body, cached.etag, if_none_match)
+
+    with response_cache.filling():
+        if if_none_match:
+            updated_at = await get_item_updated_at_async(db=db, item_id=item_id)
+            if updated_at is not None:
+                etag = item_etag(item_id, updated_at)
+                if etag_matches(if_none_match, etag):
+                    return not_modified(etag)
+
+        item = await get_item_by_id_async(db=db, item_id=item_id)
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Item not found"
         )
-    return ItemResponse.model_validate(item)
+
+    body = ItemResponse.model_validate(item).model_dump_json(by_alias=True).encode()
+    etag = item_etag(item.id, item.updated_at)
+    await response_cache.set(cache_key, body, etag)
+    return json_response(body, etag, if_none_match)
+
+
+@router.patch("/{item_id}", response_model=ItemResponse)
+async def update_item_by_id(
+    item_id: int,
+    request: ItemUpdateRequest,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    アイテム部分更新エンドポイント
+
+    リクエストに含まれるフィールドのみ更新し、更新後のアイテムを返します。
+    更新と取得は UPDATE ... RETURNING の1文で行います。
+
+    If-Match に詳細取得時のETagを指定すると、その後に他のクライアントが
+    更新していない場合のみ更新します（楽観的排他制御）。一致しない場合は
+    412 Precondition Failed を返します。
+    """
+    values = request.model_dump(exclude_unset=True)
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update"
+        )
+
+    expected_updated_at = item_versions_from_if_match(if_match, item_id) if if_match else None
+    item = await update_item_async(
+        db=db,
+        item_id=item_id,
+        values=values,
+        expected_updated_at=expected_updated_at
+    )
+    if not item:
+        # 失敗時のみ、存在しないのか競合したのかを判定する
+        if expected_updated_at is not None and (
+            await get_item_by_id_async(db=db, item_id=item_id) is not None
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Item has been modified"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Item not found"
+        )
+    await response_cache.invalidate(CACHE_TAG)
+
+    body = ItemResponse.model_validate(item).model_dump_json(by_alias=True).encode()
+    return json_response(body, item_etag(item.id, item.updated_at), None)
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_item_by_id(
+async def delete_item_by_id(
     item_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     アイテム削除エンドポイント
 
     指定されたIDのアイテムを削除します。
     """
-    success = delete_item(db=db, item_id=item_id)
+    success = await delete_item_async(db=db, item_id=item_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Item not found"
         )
+    await response_cache.invalidate(CACHE_TAG)
     return None
@@ -0,0 +1,77 @@
+from .base import CamelCaseModel
+
+
+class PoolStatusResponse(CamelCaseModel):
+    """
+    コネクションプールの状態
+
+    フロントエンド(キャメルケース):
+    {
+        "name": "async",
+        "size": 5,
+        "checkedIn": 3,
+        "checkedOut": 2,
+        "overflow": 0,
+        "maxOverflow": 10,
+        "checkouts": 1520,
+        "checkoutTimeouts": 0,
+        "avgWaitMs": 0.12,
+        "maxWaitMs": 35.4
+    }
+    """
+    name: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    checkout_timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class PoolStatsResponse(CamelCaseModel):
+    """
+    全エンジンのコネクションプール状態
+
+    フロントエンド(キャメルケース):
+    {
+        "pools": [{"name": "async", "size": 5, ...}]
+    }
+    """
+    pools: list[PoolStatusResponse]
+
+
+class CacheStatsResponse(CamelCaseModel):
+    """
+    プロセス内キャッシュの統計
+
+    フロントエンド(キャメルケース):
+    {
+        "name": "token",
+        "size": 120,
+        "maxSize": 10000,
+        "hits": 5230,
+        "misses": 140,
+        "hitRate": 0.974
+    }
+    """
+    name: str
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class CacheStatsListResponse(CamelCaseModel):
+    """
+    全キャッシュの統計
+
+    フロントエンド(キャメルケース):
+    {
+        "caches": [{"name": "token", "size": 120, ...}]
+    }
+    """
+    caches: list[CacheStatsResponse]
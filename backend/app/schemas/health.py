@@ -0,0 +1,55 @@
+from typing import Optional
+
+from .base import CamelCaseModel
+
+
+class DatabaseCheckResponse(CamelCaseModel):
+    """
+    データベース接続の確認結果
+
+    フロントエンド(キャメルケース):
+    {
+        "name": "primary",
+        "ok": true,
+        "latencyMs": 1.2,
+        "error": null
+    }
+    """
+    name: str
+    ok: bool
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class PoolCheckResponse(CamelCaseModel):
+    """
+    リクエスト処理に使用するコネクションプールの使用率
+
+    フロントエンド(キャメルケース):
+    {
+        "checkedOut": 4,
+        "capacity": 15,
+        "utilization": 0.27,
+        "saturated": false
+    }
+    """
+    checked_out: int
+    capacity: int
+    utilization: float
+    saturated: bool
+
+
+class ReadinessResponse(CamelCaseModel):
+    """
+    レディネスプローブの結果
+
+    フロントエンド(キャメルケース):
+    {
+        "status": "ready",
+        "pool": {"checkedOut": 4, "capacity": 15, "utilization": 0.27, "saturated": false},
+        "databases": [{"name": "primary", "ok": true, "latencyMs": 1.2, "error": null}]
+    }
+    """
+    status: str
+    pool: PoolCheckResponse
+    databases: list[DatabaseCheckResponse]
@@ -1,6 +1,28 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict
+from enum import Enum
+from typing import Any, Optional
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+
+
+class CountMode(str, Enum):
+    """
+    一覧取得時の総件数の算出方法
+
+    - exact: トリガーで管理しているカウンターテーブルから正確な件数を取得
+    - estimated: プランナー統計 (pg_class.reltuples) から推定値を取得
+    - none: 総件数を算出しない
+    """
+    exact = "exact"
+    estimated = "estimated"
+    none = "none"
+
+
+class ExportFormat(str, Enum):
+    """
+    エクスポートの出力形式
+    """
+    ndjson = "ndjson"
+    csv = "csv"
 
 
 class ItemBase(BaseModel):
@@ -26,6 +48,32 @@ class ItemCreateRequest(ItemBase):
     )
 
 
+class ItemUpdateRequest(BaseModel):
+    """
+    アイテム部分更新リクエスト
+
+    指定したフィールドのみ更新します。description に null を指定すると説明を削除します。
+    """
+    title: Optional[str] = Field(None, min_length=1, max_length=255, description="アイテムのタイトル")
+    description: Optional[str] = Field(None, description="アイテムの説明")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "title": "Updated Item"
+            }
+        }
+    )
+
+    @field_validator("title")
+    @classmethod
+    def title_not_null(cls, value: Optional[str]) -> str:
+        # 省略時（デフォルト値）は検証されないため、明示的な null のみ拒否される
+        if value is None:
+            raise ValueError("title cannot be null")
+        return value
+
+
 class ItemResponse(ItemBase):
     """
     アイテムレスポンス（camelCaseで返す）
@@ -54,7 +102,52 @@ class ItemListResponse(BaseModel):
     アイテム一覧レスポンス
     """
     items: list[ItemResponse]
-    total: int
+    total: Optional[int] = Field(None, description="総件数（count=noneの場合はnull）")
+    total_estimated: bool = Field(
+        False,
+        serialization_alias="totalEstimated",
+        description="totalが推定値の場合true"
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        serialization_alias="nextCursor",
+        description="次のページを取得するためのカーソル（最終ページの場合はnull）"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {
+                        "id": 1,
+                        "title": "Sample Item",
+                        "description": "This is a sample item",
+                        "createdAt": "2025-11-10T00:00:00Z",
+                        "updatedAt": "2025-11-10T00:00:00Z"
+                    }
+                ],
+                "total": 1,
+                "totalEstimated": False,
+                "nextCursor": "WyIyMDI1LTExLTEwVDAwOjAwOjAwKzAwOjAwIiwxXQ"
+            }
+        }
+    )
+
+
+class ItemSearchResponse(BaseModel):
+    """
+    アイテム検索レスポンス
+    """
+    items: list[ItemResponse]
+    fuzzy: bool = Field(
+        False,
+        description="全文検索で一致せず、タイトルの類似検索の結果を返した場合true"
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        serialization_alias="nextCursor",
+        description="次のページを取得するためのカーソル（最終ページの場合はnull）"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -68,7 +161,97 @@ class ItemListResponse(BaseModel):
                         "updatedAt": "2025-11-10T00:00:00Z"
                     }
                 ],
-                "total": 1
+                "fuzzy": False,
+                "nextCursor": "WzAsMC4wNjA3OTI3MSwxXQ"
+            }
+        }
+    )
+
+
+class ItemBulkCreateRequest(BaseModel):
+    """
+    アイテム一括作成リクエスト
+
+    各要素は ItemCreateRequest と同じ形式です。要素ごとに検証し、
+    不正な要素はエラーとして報告して残りの要素を作成します。
+    """
+    items: list[dict[str, Any]] = Field(..., min_length=1)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {"title": "Item 1", "description": "First item"},
+                    {"title": "Item 2"}
+                ]
+            }
+        }
+    )
+
+
+class ItemBulkError(BaseModel):
+    """
+    一括処理の要素ごとのエラー
+    """
+    index: int = Field(..., description="リクエスト内の要素の位置")
+    detail: str
+
+
+class ItemBulkCreateResponse(BaseModel):
+    """
+    アイテム一括作成レスポンス
+    """
+    items: list[ItemResponse]
+    errors: list[ItemBulkError]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {
+                        "id": 1,
+                        "title": "Item 1",
+                        "description": "First item",
+                        "createdAt": "2025-11-10T00:00:00Z",
+                        "updatedAt": "2025-11-10T00:00:00Z"
+                    }
+                ],
+                "errors": [
+                    {"index": 1, "detail": "title: String should have at least 1 character"}
+                ]
+            }
+        }
+    )
+
+
+class ItemBulkDeleteRequest(BaseModel):
+    """
+    アイテム一括削除リクエスト
+    """
+    ids: list[int] = Field(..., min_length=1)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "ids": [1, 2, 3]
+            }
+        }
+    )
+
+
+class ItemBulkDeleteResponse(BaseModel):
+    """
+    アイテム一括削除レスポンス
+    """
+    deleted_ids: list[int] = Field(..., serialization_alias="deletedIds")
+    not_found_ids: list[int] = Field(..., serialization_alias="notFoundIds")
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
+            "example": {
+                "deletedIds": [1, 2],
+                "notFoundIds": [3]
             }
         }
     )
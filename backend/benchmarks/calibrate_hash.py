@@ -0,0 +1,131 @@
+"""
+パスワードハッシュのコスト調整
+
+現在のハードウェアで bcrypt と argon2id のハッシュ時間を計測し、1回あたりの時間が
+目標（--target-ms）に最も近くなるパラメータを提案します。結果はJSONで出力し、
+そのまま .env に設定できる環境変数の行も含めます。
+
+- bcrypt: ラウンド数が1増えると時間が2倍になるため、目標以下で最大のラウンド数を選びます。
+- argon2id: メモリコスト（--memory-mib）と並列度を固定し、時間コストを調整します。
+  時間コスト1でも目標を超える場合はメモリコストを半分ずつ下げます。
+
+設定を変更すると、既存のハッシュはログイン成功時に新しいパラメータで再ハッシュされます。
+本番と同じ種類のマシン（コンテナのCPU制限を含む）で実行してください。
+
+実行方法 (backend/ ディレクトリで):
+    python -m benchmarks.calibrate_hash --target-ms 250
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Callable
+
+PASSWORD = "calibration-password-0123456789"
+
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+# OWASP の推奨する argon2id の最小メモリコスト（19 MiB）
+ARGON2_MIN_MEMORY_KIB = 19 * 1024
+
+
+def measure(hash_fn: Callable[[str], str], samples: int) -> float:
+    """ハッシュ1回あたりの時間（ミリ秒、中央値）"""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hash_fn(PASSWORD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(target_ms: float, samples: int) -> dict:
+    from passlib.hash import bcrypt
+
+    # using() で派生したハンドラーでは初回にバックエンドを読み込めないため、先に読み込む
+    bcrypt.get_backend()
+
+    def bcrypt_ms(rounds: int) -> float:
+        return measure(bcrypt.using(rounds=rounds, ident="2b").hash, samples)
+
+    # 基準のラウンド数から推定し、候補の前後を実測して確認する
+    base_ms = bcrypt_ms(BCRYPT_MIN_ROUNDS)
+    rounds = BCRYPT_MIN_ROUNDS
+    while rounds < BCRYPT_MAX_ROUNDS and base_ms * 2 ** (rounds + 1 - BCRYPT_MIN_ROUNDS) <= target_ms:
+        rounds += 1
+    measured_ms = bcrypt_ms(rounds)
+    while rounds > BCRYPT_MIN_ROUNDS and measured_ms > target_ms:
+        rounds -= 1
+        measured_ms = bcrypt_ms(rounds)
+    return {"rounds": rounds, "measured_ms": round(measured_ms, 1)}
+
+
+def calibrate_argon2(target_ms: float, samples: int, memory_kib: int, parallelism: int) -> dict:
+    from passlib.hash import argon2
+
+    argon2.get_backend()
+
+    def argon2_ms(time_cost: int, memory_cost: int) -> float:
+        handler = argon2.using(
+            type="ID", time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+        )
+        return measure(handler.hash, samples)
+
+    single_ms = argon2_ms(1, memory_kib)
+    while single_ms > target_ms and memory_kib // 2 >= ARGON2_MIN_MEMORY_KIB:
+        memory_kib //= 2
+        single_ms = argon2_ms(1, memory_kib)
+
+    # 時間コストにほぼ比例するため、1回分の時間から推定して実測で確認する
+    time_cost = max(1, int(target_ms // single_ms))
+    measured_ms = argon2_ms(time_cost, memory_kib)
+    while time_cost > 1 and measured_ms > target_ms:
+        time_cost -= 1
+        measured_ms = argon2_ms(time_cost, memory_kib)
+    return {
+        "time_cost": time_cost,
+        "memory_cost": memory_kib,
+        "parallelism": parallelism,
+        "measured_ms": round(measured_ms, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="ハッシュ1回あたりの目標時間（ミリ秒）")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2", "all"], default="all")
+    parser.add_argument("--samples", type=int, default=5, help="パラメータごとの計測回数（中央値を使用）")
+    parser.add_argument("--memory-mib", type=int, default=64, help="argon2id のメモリコストの上限（MiB）")
+    parser.add_argument(
+        "--parallelism", type=int, default=min(os.cpu_count() or 1, 4), help="argon2id の並列度"
+    )
+    args = parser.parse_args()
+
+    result: dict = {"target_ms": args.target_ms, "cpu_count": os.cpu_count()}
+    env: list[str] = []
+
+    if args.scheme in ("bcrypt", "all"):
+        bcrypt_params = calibrate_bcrypt(args.target_ms, args.samples)
+        result["bcrypt"] = bcrypt_params
+        env += ["PASSWORD_HASH_SCHEME=bcrypt", f"BCRYPT_ROUNDS={bcrypt_params['rounds']}"]
+
+    if args.scheme in ("argon2", "all"):
+        argon2_params = calibrate_argon2(
+            args.target_ms, args.samples, args.memory_mib * 1024, args.parallelism
+        )
+        result["argon2"] = argon2_params
+        # 両方を計測した場合は argon2id を推奨する
+        env = [
+            "PASSWORD_HASH_SCHEME=argon2",
+            f"ARGON2_TIME_COST={argon2_params['time_cost']}",
+            f"ARGON2_MEMORY_COST={argon2_params['memory_cost']}",
+            f"ARGON2_PARALLELISM={argon2_params['parallelism']}",
+        ]
+
+    result["env"] = env
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+一覧レスポンスのシリアライズ性能比較
+
+ORMオブジェクト + Pydanticモデルを経由する通常パスと、列タプルをorjsonで直接
+エンコードする高速パス（ITEMS_FAST_PATH=true）を比較します。DBは使用しません。
+
+実行方法 (backend/ ディレクトリで):
+    python -m benchmarks.serialization --items 100 --repeat 2000
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.pagination import encode_cursor
+from app.core.serialization import RowEncoder, dumps, serialization_keys
+from app.models import Item
+from app.schemas.item import ItemListResponse, ItemResponse
+
+
+def make_rows(count: int) -> tuple[list[Item], list[tuple]]:
+    """同じ内容のORMオブジェクトと列タプルを生成"""
+    encoder = RowEncoder(ItemResponse)
+    base = datetime(2025, 11, 10, tzinfo=timezone.utc)
+    items = [
+        Item(
+            id=count - i,
+            title=f"Sample Item {count - i}",
+            description="This is a sample item for benchmarking serialization",
+            created_at=base - timedelta(seconds=i),
+            updated_at=base - timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+    rows = [tuple(getattr(item, name) for name in encoder.fields) for item in items]
+    return items, rows
+
+
+def pydantic_path(items: list[Item]) -> bytes:
+    last = items[-1]
+    return ItemListResponse(
+        items=[ItemResponse.model_validate(item) for item in items],
+        total=len(items),
+        total_estimated=False,
+        next_cursor=encode_cursor(last.created_at, last.id),
+    ).model_dump_json(by_alias=True).encode()
+
+
+def make_fast_path():
+    encoder = RowEncoder(ItemResponse)
+    keys = dict(zip(ItemListResponse.model_fields, serialization_keys(ItemListResponse)))
+    id_index = encoder.fields.index("id")
+    created_at_index = encoder.fields.index("created_at")
+
+    def fast_path(rows: list[tuple]) -> bytes:
+        last = rows[-1]
+        return dumps({
+            keys["items"]: encoder.to_dicts(rows),
+            keys["total"]: len(rows),
+            keys["total_estimated"]: False,
+            keys["next_cursor"]: encode_cursor(last[created_at_index], last[id_index]),
+        })
+
+    return fast_path
+
+
+def measure(fn, arg, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    timings.sort()
+    return {
+        "mean_us": round(statistics.fmean(timings), 1),
+        "p50_us": round(timings[len(timings) // 2], 1),
+        "p99_us": round(timings[int(len(timings) * 0.99) - 1], 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100, help="1ページあたりのアイテム数")
+    parser.add_argument("--repeat", type=int, default=2000, help="計測回数")
+    args = parser.parse_args()
+
+    items, rows = make_rows(args.items)
+    fast_path = make_fast_path()
+
+    # 両方のパスが同じバイト列を返すことを確認
+    assert pydantic_path(items) == fast_path(rows), "fast path output differs from pydantic path"
+
+    pydantic_result = measure(pydantic_path, items, args.repeat)
+    fast_result = measure(fast_path, rows, args.repeat)
+    print(json.dumps({
+        "items": args.items,
+        "repeat": args.repeat,
+        "pydantic": pydantic_result,
+        "fast_path": fast_result,
+        "speedup": round(pydantic_result["mean_us"] / fast_result["mean_us"], 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
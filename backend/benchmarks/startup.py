@@ -0,0 +1,122 @@
+"""
+起動時間（インポート時間・最初のリクエストまでの時間）の計測と予算チェック
+
+新しいPythonプロセスで main をインポートし、lifespan の起動後に /health へ
+最初のリクエストを送るまでの時間を計測します。結果を startup_budget.json の
+予算と比較し、超過した場合や、遅延読み込みしているモジュール（python-jose, passlib など）が
+起動時に読み込まれている場合は終了コード1で終了します（CIでの回帰検出用）。
+
+-X importtime の結果から、自身の読み込み時間が長いモジュールも出力します。
+
+実行方法 (backend/ ディレクトリで):
+    python -m benchmarks.startup --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_FILE = Path(__file__).with_name("startup_budget.json")
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 子プロセスで実行するスクリプト（計測結果をJSONで標準出力に書き出す）
+CHILD_SCRIPT = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+import httpx
+
+async def first_request():
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            response = await client.get("/health")
+            response.raise_for_status()
+            return time.perf_counter()
+
+responded = asyncio.run(first_request())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (responded - start) * 1000,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def run_child(importtime: bool = False) -> tuple[dict, str]:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", CHILD_SCRIPT]
+    result = subprocess.run(
+        command, cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def slowest_imports(importtime_output: str, count: int) -> list[dict]:
+    """-X importtime の出力から、自身の読み込み時間が長いモジュールを抽出"""
+    entries = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append({
+            "module": name.strip(),
+            "self_ms": round(int(self_us) / 1000, 2),
+            "cumulative_ms": round(int(cumulative_us) / 1000, 2),
+        })
+    return sorted(entries, key=lambda entry: entry["self_ms"], reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="計測回数（中央値を使用）")
+    parser.add_argument("--top", type=int, default=15, help="出力する読み込みの遅いモジュール数")
+    parser.add_argument("--no-check", action="store_true", help="予算を超過しても終了コード0で終了")
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_FILE.read_text())
+
+    # 1回目はバイトコードのキャッシュ作成などを含むため計測から除外
+    run_child()
+    runs = [run_child()[0] for _ in range(args.repeat)]
+    profile, importtime_output = run_child(importtime=True)
+
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    first_request_ms = statistics.median(run["first_request_ms"] for run in runs)
+    loaded_deferred = sorted(
+        name for name in budget["deferred_modules"] if name in runs[-1]["modules"]
+    )
+
+    failures = []
+    if import_ms > budget["import_ms"]:
+        failures.append(f"import_ms {import_ms:.1f} exceeds budget {budget['import_ms']}")
+    if first_request_ms > budget["first_request_ms"]:
+        failures.append(
+            f"first_request_ms {first_request_ms:.1f} exceeds budget {budget['first_request_ms']}"
+        )
+    if loaded_deferred:
+        failures.append(f"deferred modules loaded at startup: {', '.join(loaded_deferred)}")
+
+    print(json.dumps({
+        "repeat": args.repeat,
+        "import_ms": round(import_ms, 1),
+        "first_request_ms": round(first_request_ms, 1),
+        "budget": budget,
+        "loaded_deferred_modules": loaded_deferred,
+        "slowest_imports": slowest_imports(importtime_output, args.top),
+        "failures": failures,
+    }, indent=2))
+
+    if failures and not args.no_check:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+本番サーバー設定（gunicorn + uvicornワーカー）
+
+実行方法 (backend/ ディレクトリで):
+    gunicorn main:app -c gunicorn.conf.py
+
+ワーカー数・待ち受けアドレスなどは Settings（SERVER_WORKERS, SERVER_BIND など）で変更できます。
+複数ワーカーではプロセス内メモリのキャッシュが共有されないため、Redisのバックエンドが
+設定されていない場合、ワーカー数の既定値は1になり、SERVER_WORKERS で2以上を指定すると
+起動しません（Settings.process_local_backends を参照）。
+開発時は従来どおり uvicorn main:app --reload を使用してください。
+"""
+import os
+import sys
+import tempfile
+
+from uvicorn_worker import UvicornWorker
+
+from app.core.config import settings
+
+
+class Worker(UvicornWorker):
+    """uvloop（イベントループ）と httptools（HTTPパーサー）を明示的に使うワーカー"""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+
+bind = settings.server_bind
+workers = settings.server_worker_count
+worker_class = Worker
+
+# マスターでアプリを読み込んでからforkし、ワーカーの起動時間とメモリを節約する
+preload_app = True
+
+# SIGTERM受信後、処理中のリクエストが完了するまで待つ秒数（超過したワーカーは強制終了）
+graceful_timeout = settings.server_graceful_timeout
+keepalive = settings.server_keepalive
+
+# リバースプロキシ（ロードバランサー・Ingress）のアドレス。ここに含まれる接続元からの
+# X-Forwarded-For だけを信頼し、uvicorn がクライアントのアドレスを書き換える
+# （ログイン試行のIPアドレスごとのレート制限やアクセスログで使用）
+forwarded_allow_ips = settings.server_forwarded_allow_ips
+
+accesslog = "-"
+errorlog = "-"
+
+# 複数ワーカーのPrometheusメトリクスを集約するため、各ワーカーはディレクトリに書き出す
+# （prometheus_client の読み込み前に設定する必要がある）
+if settings.metrics_enabled and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+
+def on_starting(server):
+    """複数ワーカーでプロセス内メモリのバックエンドが設定されている場合は起動しない"""
+    if workers <= 1:
+        return
+    errors = settings.process_local_backends
+    if errors:
+        server.log.error(
+            "Refusing to start %d workers with process-local backends: %s. "
+            "Use the redis backends (REDIS_URL) or set SERVER_WORKERS=1.",
+            workers, "; ".join(errors)
+        )
+        sys.exit(1)
+    if settings.rate_limit_backend == "memory":
+        server.log.warning(
+            "RATE_LIMIT_BACKEND=memory with %d workers: each worker applies its own login "
+            "limit, so the effective limit is %d times the configured one. "
+            "Use RATE_LIMIT_BACKEND=redis to share it.",
+            workers, workers
+        )
+
+
+def post_fork(server, worker):
+    """
+    fork直後のワーカーでコネクションプールを破棄
+
+    preload_app ではエンジンがマスターで作成されるため、マスターの接続を
+    ワーカー間で共有しないよう、各ワーカーは新しいプールで接続を開始します。
+    close=False はマスター側の接続を閉じずにプールの参照だけを捨てます。
+    """
+    from app.database import dispose_engines_after_fork
+
+    dispose_engines_after_fork()
+
+
+def child_exit(server, worker):
+    """終了したワーカーのPrometheusメトリクスのファイルを集計対象から外す"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,36 +1,91 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client import multiprocess
+import math
 import os
-from pathlib import Path
-from dotenv import load_dotenv
 
-# プロジェクトルートの.envファイルを読み込む
-project_root = Path(__file__).resolve().parent.parent
-env_path = project_root / ".env"
-load_dotenv(dotenv_path=env_path)
+# ルーターのインポート（.env・環境変数の読み込みは app.core.config に集約）
+from app.routers import admin, auth, health, items
+from app.core.config import settings
+from app.core.hashing import HashingBusyError, password_hasher
+from app.core.metrics import TimingMiddleware
+from app.core.rate_limit import RateLimitExceededError
+from app.core.user_cache import user_cache
+from app.core.replica import ReadYourWritesMiddleware
+from app.database import dispose_engines
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """アプリケーションの起動・終了処理"""
+    # ワーカー間のユーザーキャッシュ無効化通知の購読
+    user_cache.start()
+    # パスワードハッシュ用プロセスプールの起動
+    password_hasher.start()
+    yield
+    # 処理中のリクエストの完了後に呼ばれる（gunicornの graceful_timeout 内）
+    password_hasher.shutdown()
+    user_cache.stop()
+    await dispose_engines()
 
-# ルーターのインポート
-from app.routers import auth, items
 
 app = FastAPI(
     title="Next16-FastAPI Application",
     description="Backend API for Next16-FastAPI application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# CORS設定 - 環境変数からフロントエンドURLを取得
-frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
+# CORS設定 - 環境変数 (FRONTEND_URL) からフロントエンドURLを取得
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[frontend_url],
+    allow_origins=[settings.frontend_url],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# 書き込み後の読み取りをプライマリに固定（リードレプリカ使用時のみ）
+if settings.replica_urls:
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        window_seconds=settings.database_read_your_writes_seconds
+    )
+
+# リクエストごとの処理時間・SQL実行回数の計測（最も外側で実行されるよう最後に追加）
+if settings.metrics_enabled:
+    app.add_middleware(TimingMiddleware)
+
+
+@app.exception_handler(HashingBusyError)
+async def hashing_busy_handler(request: Request, exc: HashingBusyError):
+    """認証処理が混雑している場合は429を返す"""
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many authentication requests, please retry later"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(RateLimitExceededError)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceededError):
+    """ログイン試行のレート制限を超過した場合は429を返す"""
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many login attempts, please retry later"},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
 # ルーター登録
 app.include_router(auth.router)
 app.include_router(items.router)
+app.include_router(admin.router)
+app.include_router(health.router)
 
 
 @app.get("/")
@@ -42,13 +97,15 @@ async def root():
     }
 
 
-@app.get("/health")
-async def health_check():
-    """ヘルスチェックエンドポイント"""
-    return {
-        "status": "healthy",
-        "database": "connected"
-    }
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus メトリクスエンドポイント"""
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # 複数ワーカー（gunicorn）の場合は全ワーカーの値を集約して返す
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.get("/api/test")
@@ -56,5 +113,5 @@ async def test_endpoint():
     """テスト用エンドポイント"""
     return {
         "message": "API is working!",
-        "environment": os.getenv("ENVIRONMENT", "development")
+        "environment": settings.environment
     }
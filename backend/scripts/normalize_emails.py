@@ -0,0 +1,103 @@
+"""
+登録済みメールアドレスの正規化（小文字化）のバックフィル
+
+ログイン・登録はメールアドレスを小文字に正規化して保存・検索するようになったため、
+それ以前に大文字を含んだまま保存された行を小文字に更新します。
+
+主キーの範囲ごとに短いトランザクションで更新するため、大きなテーブルでも
+長時間のロックやレプリカの遅延を起こしません（--sleep でバッチ間に待機を入れられます）。
+大文字・小文字だけが異なるメールアドレスが既に存在する行は更新せず、件数とユーザーIDを
+出力します。これらは手動で解消してください（ix_users_email_lower の作成にも必要です）。
+
+何度実行しても安全です。結果はJSONで出力します。
+
+実行方法 (backend/ ディレクトリで):
+    python -m scripts.normalize_emails --dry-run
+    python -m scripts.normalize_emails --batch-size 1000 --sleep 0.1
+"""
+import argparse
+import json
+import time
+
+from sqlalchemy import Update, exists, func, select, update
+from sqlalchemy.orm import aliased
+
+from app.database import engine
+from app.models import User
+
+
+def _unnormalized():
+    return User.email != func.lower(User.email)
+
+
+def _normalize_batch_stmt(first_id: int, last_id: int) -> Update:
+    other = aliased(User)
+    # 小文字にすると他のユーザーと重複する行は更新しない
+    duplicate = exists().where(
+        func.lower(other.email) == func.lower(User.email), other.id != User.id
+    )
+    # 正規化はユーザー情報の変更ではないため updated_at は維持する
+    return (
+        update(User)
+        .where(User.id.between(first_id, last_id), _unnormalized(), ~duplicate)
+        .values(email=func.lower(User.email), updated_at=User.updated_at)
+    )
+
+
+def count_unnormalized() -> int:
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(User).where(_unnormalized()))
+
+
+def find_case_duplicates() -> list[list[int]]:
+    """大文字・小文字だけが異なるメールアドレスのユーザーIDのグループ"""
+    stmt = (
+        select(func.array_agg(User.id))
+        .group_by(func.lower(User.email))
+        .having(func.count() > 1)
+    )
+    with engine.connect() as conn:
+        return [sorted(ids) for ids in conn.scalars(stmt)]
+
+
+def backfill(batch_size: int, sleep: float) -> tuple[int, int]:
+    """主キーの範囲ごとにメールアドレスを小文字化し、（処理したバッチ数, 更新件数）を返す"""
+    last_id = 0
+    batches = 0
+    updated = 0
+    while True:
+        with engine.begin() as conn:
+            ids = conn.scalars(
+                select(User.id).where(User.id > last_id).order_by(User.id).limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            updated += conn.execute(_normalize_batch_stmt(ids[0], ids[-1])).rowcount
+        last_id = ids[-1]
+        batches += 1
+        if sleep:
+            time.sleep(sleep)
+    return batches, updated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000, help="1トランザクションで処理する行数")
+    parser.add_argument("--sleep", type=float, default=0.0, help="バッチ間の待機秒数")
+    parser.add_argument("--dry-run", action="store_true", help="更新せずに対象件数と重複のみ出力")
+    args = parser.parse_args()
+
+    result: dict = {"unnormalized_before": count_unnormalized()}
+    if not args.dry_run:
+        started = time.perf_counter()
+        result["batches"], result["updated"] = backfill(args.batch_size, args.sleep)
+        result["elapsed_seconds"] = round(time.perf_counter() - started, 2)
+        result["unnormalized_after"] = count_unnormalized()
+
+    duplicates = find_case_duplicates()
+    result["case_duplicates"] = {"count": len(duplicates), "user_ids": duplicates}
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()